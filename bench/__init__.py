@@ -0,0 +1,15 @@
+"""
+Benchmark suite for the site generator.
+
+    python3 -m bench --shape mixed --scale 1 --save bench/results.json
+    python3 -m bench --baseline bench/results.json --threshold 0.1
+
+See corpus.py for the synthetic content shapes and runner.py for the
+timed stages.
+"""
+import os
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
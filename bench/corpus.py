@@ -0,0 +1,128 @@
+"""
+Deterministic synthetic content trees for benchmarking.
+
+Each shape stresses a different part of the pipeline; `scale` multiplies
+the amount of content and `seed` makes the output reproducible.
+"""
+import os
+import random
+
+WORDS = (
+    "elf ring shire mountain river wizard hobbit forest tower king "
+    "sword road council shadow light song tale age star journey "
+    "friend stone gate hall fire water wind night dawn quest"
+).split()
+
+TEMPLATE = """<!doctype html>
+<html>
+  <head>
+    <meta charset="utf-8" />
+    <title>{{ Title }}</title>
+    <link href="/index.css" rel="stylesheet" />
+  </head>
+  <body>
+    <article>{{ Content }}</article>
+  </body>
+</html>
+"""
+
+# shape name -> (number of pages, per-page generator name, size per page)
+SHAPES = {
+    "small-posts": (400, "mixed", 6),
+    "huge-pages": (3, "mixed", 3000),
+    "link-dense": (60, "links", 80),
+    "long-lists": (40, "lists", 60),
+    "code-blocks": (40, "code", 40),
+    "mixed": (120, "mixed", 40),
+}
+
+
+class CorpusGenerator:
+    def __init__(self, seed=0):
+        self.random = random.Random(seed)
+
+    def words(self, count):
+        return " ".join(self.random.choice(WORDS) for _ in range(count))
+
+    def inline_text(self, count, density=0.15):
+        parts = []
+        for _ in range(count):
+            roll = self.random.random()
+            word = self.random.choice(WORDS)
+            if roll < density * 0.25:
+                parts.append(f"**{word}**")
+            elif roll < density * 0.5:
+                parts.append(f"_{word}_")
+            elif roll < density * 0.7:
+                parts.append(f"`{word}`")
+            elif roll < density * 0.85:
+                parts.append(f"[{word}](/blog/{self.random.choice(WORDS)})")
+            elif roll < density:
+                parts.append(f"![{word}](/images/{self.random.choice(WORDS)}.png)")
+            else:
+                parts.append(word)
+        return " ".join(parts)
+
+    def block(self, kind):
+        if kind == "paragraph":
+            return self.inline_text(self.random.randint(20, 80))
+        if kind == "heading":
+            return "#" * self.random.randint(2, 4) + " " + self.inline_text(5, 0.1)
+        if kind == "quote":
+            return "\n".join("> " + self.inline_text(12) for _ in range(self.random.randint(1, 4)))
+        if kind == "ulist":
+            return "\n".join("- " + self.inline_text(8) for _ in range(self.random.randint(3, 12)))
+        if kind == "olist":
+            return "\n".join(f"{i}. " + self.inline_text(8) for i in range(1, self.random.randint(3, 12) + 1))
+        if kind == "code":
+            lines = [f"func {self.random.choice(WORDS)}() {{ return {self.random.randint(0, 99)} }}" for _ in range(self.random.randint(5, 40))]
+            return "```\n" + "\n".join(lines) + "\n```"
+        raise ValueError(f"unknown block kind: {kind}")
+
+    def page(self, style, size):
+        weights = {
+            "mixed": {"paragraph": 6, "heading": 2, "quote": 1, "ulist": 1, "olist": 1, "code": 1},
+            "links": {"paragraph": 1},
+            "lists": {"ulist": 1, "olist": 1},
+            "code": {"code": 3, "paragraph": 1},
+        }[style]
+        kinds = list(weights)
+        blocks = ["# " + self.words(6).title()]
+        for kind in self.random.choices(kinds, [weights[k] for k in kinds], k=size):
+            if style == "links" and kind == "paragraph":
+                blocks.append(self.inline_text(60, density=0.6))
+            else:
+                blocks.append(self.block(kind))
+        return "\n\n".join(blocks) + "\n"
+
+
+def generate_corpus(root, shape="mixed", scale=1, seed=0):
+    """
+    Writes content/, static/ and template.html for `shape` under `root`.
+    Returns the list of generated Markdown documents' paths.
+    """
+    if shape not in SHAPES:
+        raise ValueError(f"unknown corpus shape: {shape} (choose from {', '.join(SHAPES)})")
+    page_count, style, size = SHAPES[shape]
+    page_count = max(1, int(page_count * scale))
+    generator = CorpusGenerator(seed)
+
+    paths = []
+    for i in range(page_count):
+        rel_path = "index.md" if i == 0 else os.path.join("blog", f"post-{i:05d}", "index.md")
+        path = os.path.join(root, "content", rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(generator.page(style, size))
+        paths.append(path)
+
+    static_dir = os.path.join(root, "static", "images")
+    os.makedirs(static_dir, exist_ok=True)
+    with open(os.path.join(root, "static", "index.css"), "w", encoding="utf-8") as f:
+        f.write("body { font-family: serif; }\n")
+    for word in WORDS:
+        with open(os.path.join(static_dir, f"{word}.png"), "wb") as f:
+            f.write(generator.random.randbytes(2048))
+    with open(os.path.join(root, "template.html"), "w", encoding="utf-8") as f:
+        f.write(TEMPLATE)
+    return paths
@@ -0,0 +1,60 @@
+"""
+Compares the single-pass text_to_textnodes against the legacy five-pass
+split pipeline on paragraph-heavy text.
+
+    python3 -m bench.inline [--paragraphs N] [--repeat N]
+"""
+import argparse
+import timeit
+
+import bench  # puts src/ on sys.path
+from textnode import TextNode, TextType
+from Inline_markdown import (
+    text_to_textnodes,
+    split_nodes_delimiter,
+    split_nodes_image,
+    split_nodes_link,
+)
+
+PARAGRAPHS = [
+    "In the annals of fantasy literature, few sagas can rival the tapestry woven by J.R.R. Tolkien in _The Lord of the Rings_. You can find the [wiki here](https://lotr.fandom.com/wiki/Legendarium).",
+    "With my many years as an **Archmage**, delving into ancient tomes, I have come to appreciate the dazzling tapestry of Middle-earth and its storied inhabitants.",
+    "An elaborate pantheon of deities (the `Valar` and `Maiar`) sets the stage, see ![map](/images/map.png) and [the appendix](/blog/appendix) for **details**.",
+    "Plain prose with no inline markup at all, which is the most common kind of paragraph in long-form posts and still has to be scanned completely.",
+]
+
+
+def legacy_text_to_textnodes(text):
+    nodes = [TextNode(text, TextType.TEXT)]
+    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
+    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
+    nodes = split_nodes_image(nodes)
+    return split_nodes_link(nodes)
+
+
+def run_all(func, paragraphs):
+    for paragraph in paragraphs:
+        func(paragraph)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--paragraphs", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    paragraphs = [PARAGRAPHS[i % len(PARAGRAPHS)] for i in range(args.paragraphs)]
+    for paragraph in PARAGRAPHS:
+        assert legacy_text_to_textnodes(paragraph) == text_to_textnodes(paragraph)
+
+    timings = {}
+    for name, func in (("legacy", legacy_text_to_textnodes), ("single-pass", text_to_textnodes)):
+        timer = timeit.Timer(lambda: run_all(func, paragraphs))
+        timings[name] = min(timer.repeat(repeat=args.repeat, number=1))
+        print(f"{name:>12}: {timings[name] * 1000:8.2f} ms for {len(paragraphs)} paragraphs")
+    print(f"     speedup: {timings['legacy'] / timings['single-pass']:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
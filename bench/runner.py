@@ -0,0 +1,158 @@
+"""
+Times each pipeline stage and the end-to-end build on a synthetic corpus,
+saves the results as JSON and compares them against a stored baseline.
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+import bench  # puts src/ on sys.path
+from bench.corpus import SHAPES, generate_corpus
+from Block_type import markdown_to_html_node
+from Inline_markdown import markdown_to_blocks, text_to_textnodes
+import main as site
+
+RESULTS_VERSION = 1
+
+
+def time_stage(func, repeat):
+    # Like timeit: collect first and keep the GC out of the measurement
+    runs = []
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            func()
+            runs.append(time.perf_counter() - started)
+        finally:
+            gc.enable()
+    return {"min": min(runs), "median": statistics.median(runs), "runs": runs}
+
+
+def inline_texts(documents):
+    texts = []
+    for markdown in documents:
+        for block in markdown_to_blocks(markdown):
+            if not block.startswith("```"):
+                texts.append(" ".join(block.split("\n")))
+    return texts
+
+
+def run_benchmarks(shape="mixed", scale=1, seed=0, repeat=5, stages=None):
+    with tempfile.TemporaryDirectory() as root:
+        paths = generate_corpus(root, shape, scale, seed)
+        documents = []
+        for path in paths:
+            with open(path, encoding="utf-8") as f:
+                documents.append(f.read())
+        texts = inline_texts(documents)
+        trees = [markdown_to_html_node(markdown) for markdown in documents]
+
+        def build():
+            cwd = os.getcwd()
+            os.chdir(root)
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    site.build_site("/")
+            finally:
+                os.chdir(cwd)
+
+        all_stages = {
+            "markdown_to_html_node": lambda: [markdown_to_html_node(markdown) for markdown in documents],
+            "text_to_textnodes": lambda: [text_to_textnodes(text) for text in texts],
+            "to_html": lambda: [tree.to_html() for tree in trees],
+            "build": build,
+        }
+        selected = stages or list(all_stages)
+
+        results = {}
+        for name in selected:
+            results[name] = time_stage(all_stages[name], repeat)
+
+        return {
+            "version": RESULTS_VERSION,
+            "meta": {
+                "shape": shape,
+                "scale": scale,
+                "seed": seed,
+                "repeat": repeat,
+                "pages": len(documents),
+                "bytes": sum(len(markdown.encode("utf-8")) for markdown in documents),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+            },
+            "stages": results,
+        }
+
+
+def compare(results, baseline, threshold):
+    """
+    Returns a list of (stage, baseline_min, current_min, ratio, regressed)
+    for stages present in both runs. A stage regresses when its best time
+    is more than `threshold` (a fraction) slower than the baseline's.
+    """
+    rows = []
+    for name, current in results["stages"].items():
+        previous = baseline.get("stages", {}).get(name)
+        if previous is None:
+            continue
+        ratio = current["min"] / previous["min"] if previous["min"] else float("inf")
+        rows.append((name, previous["min"], current["min"], ratio, ratio > 1 + threshold))
+    return rows
+
+
+def print_results(results):
+    meta = results["meta"]
+    print(f"corpus: {meta['shape']} x{meta['scale']} (seed {meta['seed']}), {meta['pages']} pages, {meta['bytes']} bytes")
+    for name, timing in results["stages"].items():
+        print(f"{name:>22}: min {timing['min'] * 1000:9.2f} ms   median {timing['median'] * 1000:9.2f} ms")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python3 -m bench", description="Benchmark the site generator.")
+    parser.add_argument("--shape", choices=sorted(SHAPES), default="mixed")
+    parser.add_argument("--scale", type=float, default=1, help="multiplies the number of pages")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--stage", action="append", dest="stages", help="only run this stage (repeatable)")
+    parser.add_argument("--save", metavar="PATH", help="write results as JSON")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against results saved earlier")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown vs baseline (default: 0.10)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        # Re-run on exactly the corpus the baseline was measured on
+        meta = baseline["meta"]
+        args.shape, args.scale, args.seed = meta["shape"], meta["scale"], meta["seed"]
+
+    results = run_benchmarks(args.shape, args.scale, args.seed, args.repeat, args.stages)
+    print_results(results)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved results to {args.save}")
+
+    if baseline is not None:
+        rows = compare(results, baseline, args.threshold)
+        print(f"\ncompared with {args.baseline} (threshold {args.threshold:.0%}):")
+        for name, before, after, ratio, regressed in rows:
+            flag = "REGRESSION" if regressed else "ok"
+            print(f"{name:>22}: {before * 1000:9.2f} ms -> {after * 1000:9.2f} ms  ({ratio:5.2f}x)  {flag}")
+        if any(row[4] for row in rows):
+            sys.exit(1)
@@ -1,3 +1,3 @@
 #!/bin/bash
-python3 src/main.py
-cd public && python3 -m http.server 8888
\ No newline at end of file
+# Build, serve ./docs on :8888 and rebuild + live-reload on changes
+python3 src/main.py --watch --port 8888 "$@"
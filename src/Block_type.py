@@ -1,100 +1,109 @@
-from enum import Enum, auto
-import re
 from htmlnode import ParentNode
 from Inline_markdown import text_to_textnodes
 from textnode import text_node_to_html_node, TextNode, TextType
+from profiling import stage
+import urls
+from block_scanner import BlockType, Block, classify_lines, scan_blocks, markdown_to_blocks
 
-class BlockType(Enum):
-    PARAGRAPH = "paragraph"
-    HEADING = "heading"
-    CODE = "code"
-    QUOTE = "quote"
-    UNORDERED_LIST = "unordered_list"
-    ORDERED_LIST = "ordered_list"
 
+def block_to_block_type(block):
+    return classify_lines(block.split("\n"))
 
-def markdown_to_blocks(markdown):
-    blocks = markdown.split("\n\n")
-    filtered_blocks = []
-    for block in blocks:
-        if block == "":
-            continue
-        block = block.strip()
-        filtered_blocks.append(block)
-    return filtered_blocks
 
+def markdown_to_html_node(markdown, memo=None):
+    children = list(iter_block_nodes(markdown.split("\n"), memo))
+    return ParentNode("div", children, None)
 
-def block_to_block_type(block):
-    lines = block.split("\n")
 
-    if block.startswith(("# ", "## ", "### ", "#### ", "##### ", "###### ")):
-        return BlockType.HEADING
-    if len(lines) > 1 and lines[0].startswith("```") and lines[-1].startswith("```"):
-        return BlockType.CODE
-    if block.startswith(">"):
-        for line in lines:
-            if not line.startswith(">"):
-                return BlockType.PARAGRAPH
-        return BlockType.QUOTE
-    if block.startswith("- "):
-        for line in lines:
-            if not line.startswith("- "):
-                return BlockType.PARAGRAPH
-        return BlockType.UNORDERED_LIST
-    if block.startswith("1. "):
-        i = 1
-        for line in lines:
-            if not line.startswith(f"{i}. "):
-                return BlockType.PARAGRAPH
-            i += 1
-        return BlockType.ORDERED_LIST
-    return BlockType.PARAGRAPH
-
-
-def markdown_to_html_node(markdown):
-    blocks = markdown_to_blocks(markdown)
-    children = []
-    for block in blocks:
-        html_node = block_to_html_node(block)
-        children.append(html_node)
-    return ParentNode("div", children, None)
+def iter_block_nodes(lines, memo=None):
+    """
+    Yields the HTML node for each block of `lines` (any iterable of lines,
+    e.g. an open file) as soon as the block is complete, so a caller can
+    render and drop each one without holding the whole document tree.
+    Inline text is converted through `memo`, an InlineCache, if given.
+    """
+    # The "block_split" and "tree_build" stages are kept apart for --profile
+    blocks = scan_blocks(lines)
+    resolver = urls.active()
+    while True:
+        with stage("block_split"):
+            block = next(blocks, None)
+        if block is None:
+            return
+        with stage("tree_build"):
+            references = resolver.references
+            first_reference = len(references) if references is not None else 0
+            resolver.source_line = block.start_line
+            try:
+                html_node = block_lines_to_html_node(block.block_type, block.lines, memo)
+            finally:
+                resolver.source_line = None
+            if references is not None and len(references) > first_reference:
+                locate_references(references, first_reference, block)
+        yield html_node
+
+
+def locate_references(references, first, block):
+    """
+    References recorded while converting `block` carry its first line;
+    moves each from `references[first:]` to the line its URL is on.
+    """
+    line_index = 0
+    for i in range(first, len(references)):
+        url, line = references[i]
+        for j in range(line_index, len(block.lines)):
+            if url in block.lines[j]:
+                line_index = j
+                references[i] = (url, block.start_line + j)
+                break
 
 
 def block_to_html_node(block):
-    block_type = block_to_block_type(block)
+    lines = block.split("\n")
+    with stage("block_typing"):
+        block_type = classify_lines(lines)
+    return block_lines_to_html_node(block_type, lines)
+
+
+def block_lines_to_html_node(block_type, lines, memo=None):
     if block_type == BlockType.PARAGRAPH:
-        return paragraph_to_html_node(block)
+        return paragraph_to_html_node(lines, memo)
     if block_type == BlockType.HEADING:
-        return heading_to_html_node(block)
+        return heading_to_html_node(lines, memo)
     if block_type == BlockType.CODE:
-        return code_to_html_node(block)
-    if block_type == BlockType.ORDERED_LIST:  # FIXED
-        return olist_to_html_node(block)
-    if block_type == BlockType.UNORDERED_LIST:  # FIXED
-        return ulist_to_html_node(block)
+        return code_to_html_node(lines)
+    if block_type == BlockType.ORDERED_LIST:
+        return olist_to_html_node(lines, memo)
+    if block_type == BlockType.UNORDERED_LIST:
+        return ulist_to_html_node(lines, memo)
     if block_type == BlockType.QUOTE:
-        return quote_to_html_node(block)
+        return quote_to_html_node(lines, memo)
     raise ValueError("invalid block type")
 
 
 
-def text_to_children(text):
-    text_nodes = text_to_textnodes(text)
-    children = []
-    for text_node in text_nodes:
-        html_node = text_node_to_html_node(text_node)
-        children.append(html_node)
-    return children
+def text_to_children(text, memo=None):
+    with stage("inline"):
+        if memo is not None:
+            return memo.children(text, _convert_inline)
+        return _convert_inline(text)
 
 
-def paragraph_to_html_node(block):
-    lines = block.split("\n")
+def _convert_inline(text):
+    return [text_node_to_html_node(text_node) for text_node in text_to_textnodes(text)]
+
+
+# The *_to_html_node builders take the block's lines as produced by
+# scan_blocks, so no block is split into lines more than once.
+
+def paragraph_to_html_node(lines, memo=None):
     paragraph = " ".join(lines)
-    children = text_to_children(paragraph)
+    children = text_to_children(paragraph, memo)
     return ParentNode("p", children)
 
 
-def heading_to_html_node(block):
+def heading_to_html_node(lines, memo=None):
+    block = "\n".join(lines)
     level = 0
     for char in block:
         if char == "#":
@@ -104,48 +113,47 @@ def heading_to_html_node(block):
     if level + 1 >= len(block):
         raise ValueError(f"invalid heading level: {level}")
     text = block[level + 1 :]
-    children = text_to_children(text)
+    children = text_to_children(text, memo)
     return ParentNode(f"h{level}", children)
 
 
-def code_to_html_node(block):
-    if not block.startswith("```") or not block.endswith("```"):
+def code_to_html_node(lines):
+    if not lines[0].startswith("```"):
         raise ValueError("invalid code block")
-    text = block[4:-3]
+    # Everything between the fence lines, verbatim (blank lines included);
+    # a fence left unclosed at the end of the document has no closing line
+    closed = len(lines) > 1 and lines[-1].lstrip().startswith("```")
+    text = "".join(line + "\n" for line in lines[1:-1 if closed else None])
     raw_text_node = TextNode(text, TextType.TEXT)
     child = text_node_to_html_node(raw_text_node)
     code = ParentNode("code", [child])
     return ParentNode("pre", [code])
 
 
-def olist_to_html_node(block):
-    items = block.split("\n")
+def olist_to_html_node(lines, memo=None):
     html_items = []
-    for item in items:
-        text = item[3:]
-        children = text_to_children(text)
+    for i, item in enumerate(lines, 1):
+        text = item[len(f"{i}. "):]
+        children = text_to_children(text, memo)
         html_items.append(ParentNode("li", children))
     return ParentNode("ol", html_items)
 
 
-def ulist_to_html_node(block):
-    items = block.split("\n")
+def ulist_to_html_node(lines, memo=None):
     html_items = []
-    for item in items:
+    for item in lines:
         text = item[2:]
-        children = text_to_children(text)
+        children = text_to_children(text, memo)
         html_items.append(ParentNode("li", children))
     return ParentNode("ul", html_items)
 
 
-def quote_to_html_node(block):
-    lines = block.split("\n")
+def quote_to_html_node(lines, memo=None):
     new_lines = []
     for line in lines:
         if not line.startswith(">"):
             raise ValueError("invalid quote block")
         new_lines.append(line.lstrip(">").strip())
     content = " ".join(new_lines)
-    children = text_to_children(content)
+    children = text_to_children(content, memo)
     return ParentNode("blockquote", children)
-
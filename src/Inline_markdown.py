@@ -1,15 +1,52 @@
 from textnode import TextNode, TextType
 from htmlnode import HTMLNode,LeafNode,ParentNode
+from block_scanner import markdown_to_blocks
 import re
 
 
+# One alternation covering every inline construct, so text_to_textnodes
+# can emit the final node stream in a single left-to-right scan instead
+# of one split pass (and one new list) per construct.
+INLINE_PATTERN = re.compile(
+    r"\*\*(?P<bold>.*?)\*\*"
+    r"|_(?P<italic>.*?)_"
+    r"|`(?P<code>.*?)`"
+    r"|!\[(?P<image_alt>[^\]]*)\]\((?P<image_url>[^)]+)\)"
+    r"|(?<!\!)\[(?P<link_text>[^\]]+)\]\((?P<link_url>[^)]+)\)",
+    re.DOTALL,
+)
+
+DELIMITED_TYPES = {
+    "bold": TextType.BOLD,
+    "italic": TextType.ITALIC,
+    "code": TextType.CODE,
+}
+
+
 def text_to_textnodes(text):
-    nodes = [TextNode(text, TextType.TEXT)]
-    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
-    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
-    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
-    nodes = split_nodes_image(nodes)
-    nodes = split_nodes_link(nodes)
+    if not text:
+        return [TextNode(text, TextType.TEXT)]
+    nodes = []
+    last_index = 0
+    for match in INLINE_PATTERN.finditer(text):
+        start = match.start()
+        if start > last_index:
+            nodes.append(TextNode(text[last_index:start], TextType.TEXT))
+        last_index = match.end()
+
+        kind = match.lastgroup
+        if kind == "image_url":
+            nodes.append(TextNode(match.group("image_alt"), TextType.IMAGE, match.group("image_url")))
+        elif kind == "link_url":
+            nodes.append(TextNode(match.group("link_text"), TextType.LINK, match.group("link_url")))
+        else:
+            inner = match.group(kind)
+            # Empty pairs such as `` are dropped, as split_nodes_delimiter does
+            if inner:
+                nodes.append(TextNode(inner, DELIMITED_TYPES[kind]))
+
+    if last_index < len(text):
+        nodes.append(TextNode(text[last_index:], TextType.TEXT))
     return nodes
 
 
@@ -48,26 +85,28 @@ def split_nodes_delimiter(old_nodes, delimiter, text_type):
 
 
 
+IMAGE_PATTERN = re.compile(r'!\[([^\]]*)\]\(([^)]+)\)')
+# We want to exclude image markdown (which starts with !), so negative lookbehind for '!'
+LINK_PATTERN = re.compile(r'(?<!\!)\[([^\]]+)\]\(([^)]+)\)')
+
+
 def extract_markdown_images(text):
     """
     Extracts markdown images of the form ![alt text](url)
     Returns a list of tuples: (alt_text, url)
     """
-    pattern = r'!\[([^\]]*)\]\(([^)]+)\)'
-    return re.findall(pattern, text)
+    return IMAGE_PATTERN.findall(text)
 
 def extract_markdown_links(text):
     """
     Extracts markdown links of the form [anchor text](url)
     Returns a list of tuples: (anchor_text, url)
     """
-    # We want to exclude image markdown (which starts with !), so negative lookbehind for '!'
-    pattern = r'(?<!\!)\[([^\]]+)\]\(([^)]+)\)'
-    return re.findall(pattern, text)
+    return LINK_PATTERN.findall(text)
 
 def split_nodes_image(old_nodes):
     new_nodes = []
-    pattern = re.compile(r'!\[([^\]]*)\]\(([^)]+)\)')
+    pattern = IMAGE_PATTERN
     for node in old_nodes:
         if node.text_type != TextType.TEXT:
             new_nodes.append(node)
@@ -104,7 +143,7 @@ def split_nodes_image(old_nodes):
 
 def split_nodes_link(old_nodes):
     new_nodes = []
-    pattern = re.compile(r'(?<!\!)\[([^\]]+)\]\(([^)]+)\)')
+    pattern = LINK_PATTERN
     for node in old_nodes:
         if node.text_type != TextType.TEXT:
             new_nodes.append(node)
@@ -137,13 +176,3 @@ def split_nodes_link(old_nodes):
                 new_nodes.append(TextNode(after_text, TextType.TEXT))
 
     return new_nodes
-
-
-def markdown_to_blocks(markdown):
-    # Step 1: Split by double newlines
-    raw_blocks = markdown.split("\n\n")
-    
-    # Step 2: Strip each block and remove empty ones
-    blocks = [block.strip() for block in raw_blocks if block.strip()]
-    
-    return blocks
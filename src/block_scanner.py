@@ -0,0 +1,140 @@
+from enum import Enum
+from profiling import stage
+
+
+class BlockType(Enum):
+    PARAGRAPH = "paragraph"
+    HEADING = "heading"
+    CODE = "code"
+    QUOTE = "quote"
+    UNORDERED_LIST = "unordered_list"
+    ORDERED_LIST = "ordered_list"
+
+
+HEADING_PREFIXES = ("# ", "## ", "### ", "#### ", "##### ", "###### ")
+FENCE = "```"
+
+
+class Block:
+    """
+    One Markdown block: its type, its lines (without line endings, with
+    the block's surrounding whitespace stripped, as markdown_to_blocks
+    always did) and the 1-based source line it starts on.
+    """
+
+    __slots__ = ("block_type", "lines", "start_line")
+
+    def __init__(self, block_type, lines, start_line):
+        self.block_type = block_type
+        self.lines = lines
+        self.start_line = start_line
+
+    @property
+    def text(self):
+        return "\n".join(self.lines)
+
+    def __eq__(self, other):
+        if not isinstance(other, Block):
+            return False
+        return (
+            self.block_type == other.block_type and
+            self.lines == other.lines and
+            self.start_line == other.start_line
+        )
+
+    def __repr__(self):
+        return f"Block({self.block_type}, {self.lines!r}, {self.start_line})"
+
+
+def classify_lines(lines):
+    first = lines[0]
+    if first.startswith(HEADING_PREFIXES):
+        return BlockType.HEADING
+    if len(lines) > 1 and first.startswith(FENCE) and lines[-1].startswith(FENCE):
+        return BlockType.CODE
+    if first.startswith(">"):
+        for line in lines:
+            if not line.startswith(">"):
+                return BlockType.PARAGRAPH
+        return BlockType.QUOTE
+    if first.startswith("- "):
+        for line in lines:
+            if not line.startswith("- "):
+                return BlockType.PARAGRAPH
+        return BlockType.UNORDERED_LIST
+    if first.startswith("1. "):
+        i = 1
+        for line in lines:
+            if not line.startswith(f"{i}. "):
+                return BlockType.PARAGRAPH
+            i += 1
+        return BlockType.ORDERED_LIST
+    return BlockType.PARAGRAPH
+
+
+def _opens_fence(line):
+    # A line like ```code``` is inline code in a paragraph, not a fence
+    return line.startswith(FENCE) and (line == FENCE or not line.endswith(FENCE))
+
+
+def _group_lines(lines, start_line=1):
+    """
+    Yields (lines, fenced, start_line) for each blank-line separated group
+    of `lines`. A group starting with a ``` fence runs until the closing
+    fence, blank lines included; as in CommonMark, a fence that is never
+    closed runs to the end of the document (less its trailing blank
+    lines).
+    """
+    group = []
+    group_start = start_line
+    fenced = False
+    line_number = start_line - 1
+    for line in lines:
+        line_number += 1
+        line = line.rstrip("\r\n")
+
+        if fenced:
+            group.append(line)
+            if line.lstrip().startswith(FENCE):
+                group[-1] = group[-1].rstrip()
+                yield group, True, group_start
+                group = []
+                fenced = False
+            continue
+
+        if not line.strip():
+            if group:
+                group[-1] = group[-1].rstrip()
+                yield group, False, group_start
+                group = []
+            continue
+
+        if not group:
+            line = line.lstrip()
+            group_start = line_number
+            fenced = _opens_fence(line)
+        group.append(line)
+
+    if fenced:
+        # Unclosed fence: its trailing blank lines are not code
+        while not group[-1].strip():
+            group.pop()
+    if group:
+        group[-1] = group[-1].rstrip()
+        yield group, fenced, group_start
+
+
+def scan_blocks(lines, start_line=1):
+    """
+    Single pass over an iterable of lines (a list, or an open file) that
+    yields a Block for every Markdown block as soon as it is complete.
+    Blocks are separated by blank lines, except inside ``` fences.
+    """
+    for group, fenced, group_start in _group_lines(lines, start_line):
+        with stage("block_typing"):
+            block_type = BlockType.CODE if fenced else classify_lines(group)
+        yield Block(block_type, group, group_start)
+
+
+def markdown_to_blocks(markdown):
+    return [block.text for block in scan_blocks(markdown.split("\n"))]
@@ -0,0 +1,49 @@
+"""
+Thin client for the build daemon (`python3 src/main.py --daemon`):
+
+    python3 src/build_client.py build [path ...]
+    python3 src/build_client.py ping | stop
+
+Prints the build log and exits with the build's status. Only imports
+what it needs to talk to the socket, so it starts quickly.
+"""
+import json
+import os
+import socket
+import sys
+
+DEFAULT_SOCKET = ".cache/build.sock"
+STATUS_PREFIX = "\0status "
+
+
+def request(words, socket_path=DEFAULT_SOCKET, out=sys.stdout):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall((json.dumps(words) + "\n").encode("utf-8"))
+        with sock.makefile("r", encoding="utf-8") as responses:
+            for line in responses:
+                if line.startswith(STATUS_PREFIX):
+                    return int(line[len(STATUS_PREFIX):])
+                out.write(line)
+                out.flush()
+    return 1  # connection closed before the build finished
+
+
+def main(argv=None):
+    args = sys.argv[1:] if argv is None else argv
+    socket_path = os.environ.get("BUILD_DAEMON_SOCKET", DEFAULT_SOCKET)
+    if not args:
+        args = ["build"]
+    if args[0] == "build":
+        # The daemon may run in another directory
+        args = ["build"] + [os.path.abspath(path) for path in args[1:]]
+    try:
+        return request(args, socket_path)
+    except (FileNotFoundError, ConnectionRefusedError):
+        print(f"No build daemon listening on {socket_path}; start one with: python3 src/main.py --daemon",
+              file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+from inline_cache import InlineCache
+from parse_cache import ParseCache
+
+DEFAULT_STREAM_THRESHOLD = 16 * 1024 * 1024
+DEFAULT_POSTS_PER_PAGE = 10
+
+
+class BuildSettings:
+    """
+    How pages are built, beyond their paths and basepath: set once from
+    the command line, passed to build_site and on to every page. Worker
+    processes get a pickled copy when they start.
+
+    stream_threshold: sources larger than this many bytes are converted
+        by generate_page_streaming instead of being read into memory.
+    search: whether pages' searchable text is collected for the search
+        index.
+    pipeline_depth: with more than 0, serial builds read sources and
+        write pages on I/O threads, up to this many pages ahead of /
+        behind the parser.
+    blog_dir: content directory (e.g. "blog") whose pages get a paginated
+        index and tag pages built from their front matter, or None;
+        posts_per_page is how many posts each of those pages lists.
+    include_drafts: whether pages marked "draft: true" are built.
+    minifier, parse_cache, inline_cache: an HtmlMinifier, ParseCache (or
+        MemoryParseCache) and InlineCache to use, or None.
+    """
+
+    def __init__(
+        self,
+        stream_threshold=DEFAULT_STREAM_THRESHOLD,
+        search=False,
+        pipeline_depth=0,
+        blog_dir=None,
+        posts_per_page=DEFAULT_POSTS_PER_PAGE,
+        include_drafts=False,
+        minifier=None,
+        parse_cache=None,
+        inline_cache=None,
+    ):
+        self.stream_threshold = stream_threshold
+        self.search = search
+        self.pipeline_depth = pipeline_depth
+        self.blog_dir = blog_dir
+        self.posts_per_page = posts_per_page
+        self.include_drafts = include_drafts
+        self.minifier = minifier
+        self.parse_cache = parse_cache
+        self.inline_cache = inline_cache
+
+    def __getstate__(self):
+        # What a worker process starts with: an in-memory parse cache
+        # stays with the daemon process, and each worker fills its own
+        # inline cache
+        state = dict(self.__dict__)
+        if not isinstance(self.parse_cache, ParseCache):
+            state["parse_cache"] = None
+        if self.inline_cache is not None:
+            state["inline_cache"] = InlineCache(self.inline_cache.max_entries)
+        return state
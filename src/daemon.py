@@ -0,0 +1,118 @@
+import contextlib
+import json
+import os
+import socketserver
+import time
+
+DEFAULT_SOCKET = ".cache/build.sock"
+
+# The last line of every response: STATUS_PREFIX followed by the exit
+# status (0 = success), so the client knows the build has finished.
+STATUS_PREFIX = "\0status "
+
+
+class SocketWriter:
+    """File-like object that sends everything printed to the client."""
+
+    def __init__(self, wfile):
+        self.wfile = wfile
+
+    def write(self, text):
+        try:
+            self.wfile.write(text.encode("utf-8"))
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # client went away; finish the build anyway
+        return len(text)
+
+    def flush(self):
+        try:
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+class BuildRequestHandler(socketserver.StreamRequestHandler):
+    """
+    Handles one request per connection, a JSON list of words (or a plain
+    line of words):
+
+      build [path ...]   rebuild, optionally only the given pages
+      ping               check that the daemon is running
+      stop               shut the daemon down
+
+    The build log is streamed back, followed by the status line.
+    """
+
+    def handle(self):
+        line = self.rfile.readline().decode("utf-8")
+        try:
+            words = json.loads(line)  # as sent by build_client
+        except ValueError:
+            words = None
+        if not isinstance(words, list):
+            words = line.split()  # typed by hand, e.g. with nc -U
+        command, args = (words[0], words[1:]) if words else ("", [])
+        out = SocketWriter(self.wfile)
+
+        if command == "ping":
+            status = 0
+        elif command == "stop":
+            out.write("Stopping\n")
+            self.server.stopping = True
+            status = 0
+        elif command == "build":
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(out):
+                status = self.server.run_build(args)
+                print(f"Built in {time.perf_counter() - started:.2f}s")
+        else:
+            out.write(f"Unknown command: {command!r} (expected build, ping or stop)\n")
+            status = 2
+        out.write(f"{STATUS_PREFIX}{status}\n")
+        out.flush()
+
+
+class BuildServer(socketserver.UnixStreamServer):
+    # Requests are handled one at a time, so builds never overlap
+    def __init__(self, socket_path, build):
+        self.build = build
+        self.stopping = False
+        super().__init__(socket_path, BuildRequestHandler)
+
+    def run_build(self, paths):
+        try:
+            self.build(paths)
+        except RuntimeError as e:
+            print(f"Build failed: {e}")
+            return 1
+        except Exception as e:
+            # Keep the daemon alive whatever a build does
+            print(f"Build crashed: {type(e).__name__}: {e}")
+            return 1
+        return 0
+
+
+def serve(build, socket_path=DEFAULT_SOCKET):
+    """
+    Listens on the Unix socket `socket_path` and calls `build(paths)` for
+    every build request, in this process, so imports, compiled patterns,
+    templates and in-memory caches stay warm between builds. `paths` is
+    the list of absolute paths the client asked for (empty for a whole
+    build).
+    """
+    if os.path.dirname(socket_path):
+        os.makedirs(os.path.dirname(socket_path), exist_ok=True)
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(socket_path)  # left over from a daemon that was killed
+
+    server = BuildServer(socket_path, build)
+    print(f"Build daemon listening on {socket_path} (Ctrl+C to stop)")
+    try:
+        while not server.stopping:
+            server.handle_request()
+    except KeyboardInterrupt:
+        print("Stopping")
+    finally:
+        server.server_close()
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(socket_path)
@@ -0,0 +1,188 @@
+import functools
+import os
+import threading
+import time
+import traceback
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+LIVERELOAD_PATH = "/__livereload"
+LIVERELOAD_SCRIPT = (
+    '<script>new EventSource("' + LIVERELOAD_PATH + '").onmessage = '
+    "function () { location.reload(); };</script>"
+)
+
+
+def snapshot(paths):
+    """
+    Returns {file path: (mtime_ns, size)} for every file under `paths`
+    (files or directories).
+    """
+    state = {}
+    for path in paths:
+        if os.path.isfile(path):
+            stat = os.stat(path)
+            state[path] = (stat.st_mtime_ns, stat.st_size)
+            continue
+        for root, dirs, files in os.walk(path):
+            for file_name in files:
+                file_path = os.path.join(root, file_name)
+                try:
+                    stat = os.stat(file_path)
+                except FileNotFoundError:
+                    continue  # removed while walking
+                state[file_path] = (stat.st_mtime_ns, stat.st_size)
+    return state
+
+
+def changed_paths(previous, current):
+    changed = {path for path in current if previous.get(path) != current[path]}
+    changed.update(path for path in previous if path not in current)
+    return changed
+
+
+class ReloadNotifier:
+    """
+    Hands out a generation number that increases after every rebuild;
+    live-reload connections wait for it to move.
+    """
+
+    def __init__(self):
+        self.generation = 0
+        self.condition = threading.Condition()
+
+    def notify(self):
+        with self.condition:
+            self.generation += 1
+            self.condition.notify_all()
+
+    def wait(self, generation, timeout):
+        with self.condition:
+            self.condition.wait_for(lambda: self.generation != generation, timeout)
+            return self.generation
+
+
+class Watcher:
+    """
+    Polls the watched paths every `interval` seconds and calls
+    `on_change(paths)` once a burst of changes has been quiet for
+    `debounce` seconds, so saving many files triggers one rebuild.
+    """
+
+    def __init__(self, paths, on_change, interval=0.3, debounce=0.2):
+        self.paths = paths
+        self.on_change = on_change
+        self.interval = interval
+        self.debounce = debounce
+
+    def run(self, stop_event):
+        previous = snapshot(self.paths)
+        pending = set()
+        last_change = 0.0
+        while not stop_event.wait(self.interval):
+            current = snapshot(self.paths)
+            changed = changed_paths(previous, current)
+            previous = current
+            if changed:
+                pending |= changed
+                last_change = time.monotonic()
+            elif pending and time.monotonic() - last_change >= self.debounce:
+                self.on_change(sorted(pending))
+                pending = set()
+
+
+class LiveReloadHandler(SimpleHTTPRequestHandler):
+    def __init__(self, *args, notifier, basepath="/", **kwargs):
+        self.notifier = notifier
+        self.basepath = basepath
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self):
+        if self.path == LIVERELOAD_PATH:
+            self.send_events()
+            return
+        path = self.translate_path(self.path)
+        if os.path.isdir(path) and self.path.split("?", 1)[0].endswith("/"):
+            path = os.path.join(path, "index.html")
+        if path.endswith(".html") and os.path.isfile(path):
+            self.send_html(path)
+            return
+        super().do_GET()
+
+    def translate_path(self, path):
+        # Serve the site under its basepath, like the real host does
+        if self.basepath != "/" and path.startswith(self.basepath):
+            path = "/" + path[len(self.basepath):]
+        return super().translate_path(path)
+
+    def send_html(self, path):
+        with open(path, "rb") as f:
+            body = f.read()
+        script = LIVERELOAD_SCRIPT.encode("utf-8")
+        index = body.rfind(b"</body>")
+        body = body[:index] + script + body[index:] if index != -1 else body + script
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_events(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        generation = self.notifier.generation
+        try:
+            while True:
+                latest = self.notifier.wait(generation, timeout=15)
+                if latest != generation:
+                    generation = latest
+                    self.wfile.write(b"data: reload\n\n")
+                else:
+                    self.wfile.write(b": ping\n\n")  # detects closed tabs
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def watch_and_serve(build, watch_paths, directory, basepath="/", port=8888):
+    """
+    Runs `build(incremental=False)` once, serves `directory` on `port`,
+    then calls `build(incremental=True)` after every settled change under
+    `watch_paths` and tells connected browsers to reload.
+    """
+    def run_build(incremental):
+        try:
+            build(incremental)
+        except RuntimeError as e:
+            print(f"Build failed: {e}")
+        except Exception:
+            # Keep serving whatever a build does; the next save rebuilds
+            print("Build crashed:")
+            traceback.print_exc()
+
+    run_build(False)
+
+    notifier = ReloadNotifier()
+    handler = functools.partial(LiveReloadHandler, directory=directory, notifier=notifier, basepath=basepath)
+    server = ThreadingHTTPServer(("", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"Serving {directory} at http://localhost:{port}{basepath} (watching for changes, Ctrl+C to stop)")
+
+    def on_change(paths):
+        print(f"Changed: {', '.join(paths)}")
+        started = time.perf_counter()
+        run_build(True)
+        print(f"Rebuilt in {time.perf_counter() - started:.2f}s")
+        notifier.notify()
+
+    stop_event = threading.Event()
+    try:
+        Watcher(watch_paths, on_change).run(stop_event)
+    except KeyboardInterrupt:
+        print("Stopping")
+    finally:
+        server.shutdown()
+        server.server_close()
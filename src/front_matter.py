@@ -0,0 +1,144 @@
+import itertools
+import re
+
+FENCE = "---"
+
+# How many lines after the front matter scan_metadata reads looking for
+# an H1 when the front matter has no title
+HEAD_LINES = 32
+
+# Front matter is metadata, not content: a --- line not closed within
+# this much is a thematic break, and the rest of the file is not read
+MAX_FRONT_MATTER_LINES = 200
+MAX_FRONT_MATTER_BYTES = 16 * 1024
+
+TRUE_VALUES = {"true", "yes", "on"}
+FALSE_VALUES = {"false", "no", "off"}
+KEY_PATTERN = re.compile(r"^([A-Za-z_][\w-]*)\s*:(.*)$")
+
+
+def parse_value(text):
+    text = text.strip()
+    if len(text) >= 2 and text[0] == text[-1] and text[0] in "\"'":
+        return text[1:-1]
+    if text.startswith("[") and text.endswith("]"):
+        return [parse_value(item) for item in text[1:-1].split(",") if item.strip()]
+    if text.lower() in TRUE_VALUES:
+        return True
+    if text.lower() in FALSE_VALUES:
+        return False
+    return text
+
+
+def parse_front_matter(lines):
+    """
+    Parses the lines between the --- fences: "key: value" pairs, where a
+    value may be quoted, a [a, b] list or a boolean, and a key with no
+    value may be followed by "- item" lines. That is all of YAML pages
+    need; anything else is ignored.
+    """
+    metadata = {}
+    list_key = None  # the key whose "- item" lines follow
+    for line in lines:
+        line = line.rstrip("\r\n")
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        if stripped.startswith("- ") and list_key is not None:
+            metadata[list_key].append(parse_value(stripped[2:]))
+            continue
+        list_key = None
+        match = KEY_PATTERN.match(line)
+        if match is None:
+            continue
+        key, value = match.group(1).lower(), match.group(2).strip()
+        if value:
+            metadata[key] = parse_value(value)
+        else:
+            metadata[key] = []
+            list_key = key
+    return metadata
+
+
+def read_front_matter(lines):
+    """
+    Reads the front matter at the start of `lines` (a list or an open
+    file). Returns (metadata, size, rest): the parsed metadata, how many
+    lines it took and an iterator over the lines after it. Without front
+    matter (or without a closing fence within MAX_FRONT_MATTER_LINES /
+    _BYTES) the metadata is empty and `rest` yields every line. At most
+    that much is buffered, so a stray --- never reads the whole file.
+    """
+    lines = iter(lines)
+    first = next(lines, None)
+    if first is None:
+        return {}, 0, lines
+    if first.rstrip() != FENCE:
+        return {}, 0, itertools.chain([first], lines)
+    head = []
+    size = len(first)
+    for line in lines:
+        if line.rstrip() == FENCE:
+            return parse_front_matter(head), len(head) + 2, lines
+        head.append(line)
+        size += len(line)
+        if len(head) >= MAX_FRONT_MATTER_LINES or size > MAX_FRONT_MATTER_BYTES:
+            break
+    return {}, 0, itertools.chain([first], head, lines)
+
+
+def strip_front_matter(lines):
+    """
+    Returns (metadata, lines) where the front matter lines are blank, so
+    the Markdown after it keeps its line numbers.
+    """
+    metadata, size, rest = read_front_matter(lines)
+    return metadata, itertools.chain([""] * size, rest)
+
+
+def split_front_matter(text):
+    # Same as strip_front_matter, for a whole source
+    if not text.startswith(FENCE):
+        return {}, text
+    metadata, lines = strip_front_matter(text.split("\n"))
+    return metadata, "\n".join(lines)
+
+
+def normalize(metadata, title=None):
+    """
+    Returns `metadata` with the keys listing pages use in a known shape:
+    "title" (falling back to `title`), "date" (an ISO 8601 string, so
+    dates sort as text), "tags" (a list of strings) and "draft" (a bool).
+    """
+    metadata = dict(metadata)
+    if not isinstance(metadata.get("title"), str) or not metadata["title"]:
+        metadata["title"] = title
+    date = metadata.get("date")
+    metadata["date"] = str(date) if date not in (None, [], "") else None
+    tags = metadata.get("tags") or []
+    if isinstance(tags, str):
+        tags = tags.split(",")
+    elif not isinstance(tags, list):
+        tags = [tags]
+    metadata["tags"] = [str(tag).strip() for tag in tags if str(tag).strip()]
+    metadata["draft"] = metadata.get("draft") is True
+    return metadata
+
+
+def scan_metadata(path, head_lines=HEAD_LINES):
+    """
+    Reads the metadata of a page from the head of its source: the front
+    matter and, if it has no title, the first H1 within `head_lines`
+    lines after it. The rest of the file is neither read nor parsed, so
+    this stays cheap for listing thousands of pages.
+    """
+    with open(path, "r", encoding="utf-8") as source:
+        metadata, _, rest = read_front_matter(source)
+        title = None
+        if not metadata.get("title"):
+            for line in itertools.islice(rest, head_lines):
+                stripped = line.lstrip()
+                if stripped.startswith("# "):
+                    title = stripped[2:].strip()
+                    break
+    return normalize(metadata, title)
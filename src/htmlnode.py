@@ -1,26 +1,55 @@
+import sys
 from enum import Enum
+from types import MappingProxyType
+
+# Shared, read-only stand-ins for "no props" / "no children" so leaf nodes
+# don't each allocate an empty dict and list.
+NO_PROPS = MappingProxyType({})
+NO_CHILDREN = ()
 
 class HTMLNode:
+    __slots__ = ("tag", "value", "children", "_props", "_props_html")
+
     def __init__(self, tag=None, value=None, children=None, props=None):
-        self.tag = tag                     # e.g., "p", "a", "h1", etc.
+        self.tag = sys.intern(tag) if type(tag) is str else tag   # e.g., "p", "a", "h1", etc.
         self.value = value                 # e.g., inner text
-        self.children = children or []     # list of HTMLNode objects
-        self.props = props or {}           # e.g., {"href": "https://..."}
+        self.children = children or NO_CHILDREN   # list of HTMLNode objects
+        self.props = props                 # e.g., {"href": "https://..."}
+    @property
+    def props(self):
+        return self._props
+    @props.setter
+    def props(self, props):
+        self._props = props or NO_PROPS
+        # props_to_html() is cached; assigning new props resets the cache.
+        # Mutating the dict in place after rendering is not picked up.
+        self._props_html = None
     def to_html(self):
-        raise NotImplementedError("Subclasses must implement to_html()")
+        chunks = []
+        self.render_to(chunks.append)
+        return "".join(chunks)
+    def render_to(self, write):
+        # Streams the rendered HTML as a sequence of string chunks passed
+        # to `write` (e.g. a file's write method), without building the
+        # full string for every subtree.
+        raise NotImplementedError("Subclasses must implement render_to()")
     def props_to_html(self):
-        if not self.props:
-            return ""
-        return "".join(f' {key}="{value}"' for key, value in self.props.items())
+        html = self._props_html
+        if html is None:
+            html = "".join(f' {key}="{value}"' for key, value in self._props.items())
+            self._props_html = html
+        return html
     def __repr__(self):
         return (
             f"HTMLNode(tag={repr(self.tag)}, "
             f"value={repr(self.value)}, "
-            f"children={repr(self.children)}, "
-            f"props={repr(self.props)})"
+            f"children={repr(list(self.children))}, "
+            f"props={repr(dict(self.props))})"
         )
 
 class LeafNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, value, props=None):
         if value is None:
             raise ValueError("LeafNode must have a value.")
@@ -35,7 +64,12 @@ class LeafNode(HTMLNode):
         
         return f"<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>"
 
+    def render_to(self, write):
+        write(self.to_html())
+
 class ParentNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, children, props=None):
         if tag is None:
             raise ValueError("ParentNode must have a tag.")
@@ -43,12 +77,14 @@ class ParentNode(HTMLNode):
             raise ValueError("ParentNode must have children.")
         super().__init__(tag=tag, value=None, children=children, props=props)
 
-    def to_html(self):
+    def render_to(self, write):
         if self.tag is None:
             raise ValueError("ParentNode must have a tag to render HTML.")
         if self.children is None:
             raise ValueError("ParentNode must have children to render HTML.")
         
-        # Recursively render children to HTML strings
-        children_html = "".join(child.to_html() for child in self.children)
-        return f"<{self.tag}{self.props_to_html()}>{children_html}</{self.tag}>"
\ No newline at end of file
+        # Children stream straight into `write`; no per-subtree strings
+        write(f"<{self.tag}{self.props_to_html()}>")
+        for child in self.children:
+            child.render_to(write)
+        write(f"</{self.tag}>")
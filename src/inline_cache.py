@@ -0,0 +1,53 @@
+from collections import OrderedDict
+import urls
+
+DEFAULT_MAX_ENTRIES = 10000
+
+class InlineCache:
+    """
+    Bounded LRU memo of inline Markdown text -> the HTML nodes it
+    converts to, for text that repeats across blocks and pages (list
+    items, link lines, footers). Keyed by the raw text and the URL
+    resolver's configuration, since links are resolved during
+    conversion; the URLs resolved for an entry are replayed into the
+    resolver on every hit so the page's references stay complete.
+    Cached nodes are shared between pages and must not be modified.
+    Each process keeps its own cache.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # (text, resolver key) -> (nodes, urls)
+        self.hits = 0
+        self.misses = 0
+
+    def children(self, text, convert):
+        """
+        Returns a new list of the nodes for `text`, calling
+        convert(text) only if they are not cached.
+        """
+        resolver = urls.active()
+        key = (text, resolver.key())
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            nodes, resolved = entry
+            _replay(resolver, resolved)
+            return list(nodes)
+
+        self.misses += 1
+        with resolver.recording_references() as references:
+            nodes = convert(text)
+        resolved = tuple(url for url, _ in references)
+        _replay(resolver, resolved)
+        self.entries[key] = (tuple(nodes), resolved)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return nodes
+
+
+def _replay(resolver, resolved):
+    # Records the URLs an entry resolved as references of the current block
+    if resolver.references is not None:
+        resolver.references.extend((url, resolver.source_line) for url in resolved)
@@ -0,0 +1,74 @@
+import posixpath
+import re
+
+# "https:", "mailto:", "data:" ... anything with a scheme is external
+SCHEME_PATTERN = re.compile(r"^[A-Za-z][A-Za-z0-9+.-]*:")
+
+
+def page_url(rel_html_path):
+    """
+    The URL a generated page is served at: "blog/tom/index.html" ->
+    "/blog/tom/", "about.html" -> "/about.html".
+    """
+    url = "/" + rel_html_path.replace("\\", "/")
+    if url.endswith("/index.html"):
+        url = url[:-len("index.html")]
+    return url
+
+
+def internal_path(url, base_url="/"):
+    """
+    Returns the site path a link points to, resolved against the URL of
+    the page containing it, or None for external links and bare
+    "#fragment" links.
+    """
+    if not url or url.startswith(("#", "//")) or SCHEME_PATTERN.match(url):
+        return None
+    path = url.split("#", 1)[0].split("?", 1)[0]
+    if not path.startswith("/"):
+        path = posixpath.join(posixpath.dirname(base_url), path)
+    trailing = "/" if path.endswith("/") else ""
+    path = posixpath.normpath(path)
+    if path == "/":
+        return path
+    return path + trailing
+
+
+class LinkIndex:
+    """
+    Every internal link and image reference on the site, and every path
+    the built site serves. References are (url, line) pairs recorded
+    while pages are parsed, so checking them needs no second read of the
+    sources. A line of None means the reference came from the template.
+    """
+
+    def __init__(self):
+        self.targets = set()
+        self.references = {}  # source path -> (page url, [(url, line), ...])
+
+    def add_page(self, source_path, rel_html_path, references):
+        url = page_url(rel_html_path)
+        self.add_target(url)
+        self.references[source_path] = (url, references)
+
+    def add_target(self, url):
+        self.targets.add(url)
+        if url.endswith("/"):
+            # "/blog/tom/" is also reachable as "/blog/tom" and ".../index.html"
+            if url != "/":
+                self.targets.add(url[:-1])
+            self.targets.add(url + "index.html")
+
+    def broken(self):
+        """
+        Returns (source path, line, url) for every reference to a path the
+        site doesn't serve, sorted by source.
+        """
+        broken = []
+        for source_path in sorted(self.references):
+            base_url, references = self.references[source_path]
+            for url, line in references:
+                path = internal_path(url, base_url)
+                if path is not None and path not in self.targets:
+                    broken.append((source_path, line, url))
+        return broken
@@ -0,0 +1,135 @@
+import re
+from html import escape
+
+TAGS_URL = "/tags/"
+SLUG_PATTERN = re.compile(r"[^\w]+")
+
+
+def tag_slug(tag):
+    return SLUG_PATTERN.sub("-", tag.lower()).strip("-_")
+
+
+def numbered_url(base_url, number):
+    # "/blog/" for the first page, then "/blog/page/2/", ...
+    return base_url if number == 1 else f"{base_url}page/{number}/"
+
+
+class Listing:
+    """One page of a paginated list of posts: (url, metadata) pairs."""
+
+    def __init__(self, url, title, posts, number, count, base_url):
+        self.url = url
+        self.title = title
+        self.posts = posts
+        self.number = number
+        self.count = count
+        self.prev_url = numbered_url(base_url, number - 1) if number > 1 else None
+        self.next_url = numbered_url(base_url, number + 1) if number < count else None
+
+    def page_title(self):
+        if self.number == 1:
+            return self.title
+        return f"{self.title} (page {self.number} of {self.count})"
+
+    def render(self, resolve):
+        """
+        The page's content. Links go through `resolve`, so they get the
+        basepath and are recorded like those of Markdown pages.
+        """
+        parts = [f"<div><h1>{escape(self.title)}</h1>"]
+        if self.posts:
+            parts.append('<ul class="posts">')
+            for url, metadata in self.posts:
+                parts.append(render_post(url, metadata, resolve))
+            parts.append("</ul>")
+        if self.count > 1:
+            parts.append('<nav class="pagination">')
+            if self.prev_url:
+                parts.append(f'<a href="{escape(resolve(self.prev_url))}" rel="prev">Newer</a> ')
+            parts.append(f"<span>Page {self.number} of {self.count}</span>")
+            if self.next_url:
+                parts.append(f' <a href="{escape(resolve(self.next_url))}" rel="next">Older</a>')
+            parts.append("</nav>")
+        parts.append("</div>")
+        return "".join(parts)
+
+
+def render_post(url, metadata, resolve):
+    title = metadata["title"] or "Untitled Page"
+    parts = [f'<li><a href="{escape(resolve(url))}">{escape(title)}</a>']
+    if metadata["date"]:
+        date = escape(metadata["date"])
+        parts.append(f' <time datetime="{date}">{date}</time>')
+    tags = [tag for tag in metadata["tags"] if tag_slug(tag)]
+    if tags:
+        links = ", ".join(
+            f'<a href="{escape(resolve(TAGS_URL + tag_slug(tag) + "/"))}">{escape(tag)}</a>' for tag in tags
+        )
+        parts.append(f' <span class="tags">{links}</span>')
+    parts.append("</li>")
+    return "".join(parts)
+
+
+def sort_posts(posts):
+    # Newest first, undated posts last; by title within the same date
+    posts = sorted(posts, key=lambda post: (post[1]["title"] or "", post[0]))
+    return sorted(posts, key=lambda post: post[1]["date"] or "", reverse=True)
+
+
+def paginate(base_url, title, posts, per_page):
+    chunks = [posts[i:i + per_page] for i in range(0, len(posts), per_page)] or [[]]
+    return [
+        Listing(numbered_url(base_url, number), title, chunk, number, len(chunks), base_url)
+        for number, chunk in enumerate(chunks, 1)
+    ]
+
+
+def listing_pages(metadata_index, blog_url, blog_title, per_page):
+    """
+    Returns the listing pages for the posts in `metadata_index` (a dict
+    mapping page URLs to metadata from front_matter.scan_metadata): the
+    posts under `blog_url`, newest first, `per_page` to a page; a page
+    for each tag with the posts carrying it; and a list of all tags at
+    TAGS_URL. Only the metadata is needed, never the posts' bodies.
+    """
+    posts = sort_posts([
+        (url, metadata) for url, metadata in metadata_index.items()
+        if url.startswith(blog_url) and url != blog_url
+    ])
+    listings = paginate(blog_url, blog_title, posts, per_page)
+
+    tagged = {}  # slug -> (tag as the newest post spells it, posts)
+    for url, metadata in posts:
+        for tag in metadata["tags"]:
+            slug = tag_slug(tag)
+            if slug:
+                tagged.setdefault(slug, (tag, []))[1].append((url, metadata))
+    if not tagged:
+        return listings
+    for slug in sorted(tagged):
+        tag, tag_posts = tagged[slug]
+        listings += paginate(f"{TAGS_URL}{slug}/", f"Tagged: {tag}", tag_posts, per_page)
+    listings.append(TagIndex(tagged))
+    return listings
+
+
+class TagIndex:
+    """The page at TAGS_URL, linking to every tag's listing."""
+
+    url = TAGS_URL
+
+    def __init__(self, tagged):
+        self.tagged = tagged
+
+    def page_title(self):
+        return "Tags"
+
+    def render(self, resolve):
+        parts = ['<div><h1>Tags</h1><ul class="tags">']
+        for slug in sorted(self.tagged):
+            tag, posts = self.tagged[slug]
+            parts.append(
+                f'<li><a href="{escape(resolve(TAGS_URL + slug + "/"))}">{escape(tag)}</a> ({len(posts)})</li>'
+            )
+        parts.append("</ul></div>")
+        return "".join(parts)
@@ -2,67 +2,204 @@ from textnode import TextNode, TextType
 import os
 import shutil
 import sys
+import argparse
+import io
+import contextlib
+import functools
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from Inline_markdown import markdown_to_blocks,split_nodes_link,split_nodes_image,split_nodes_delimiter,text_to_textnodes
-from Block_type import markdown_to_html_node
+from Block_type import markdown_to_html_node, iter_block_nodes
+from htmlnode import LeafNode
+from manifest import BuildManifest, MANIFEST_NAME
+from template import load_template, find_template
+import urls
+from link_index import LinkIndex, internal_path, page_url
+from search_index import SearchDocument, write_search_index
+from front_matter import split_front_matter, strip_front_matter, normalize, scan_metadata
+from listings import listing_pages
+from static_sync import sync_static_files, asset_map, write_asset_manifest, ASSET_MANIFEST_NAME
+import precompress
+from minify import HtmlMinifier
+import profiling
+import inline_cache
+from inline_cache import InlineCache
+from parse_cache import ParseCache, MemoryParseCache
+from build_settings import BuildSettings, DEFAULT_STREAM_THRESHOLD, DEFAULT_POSTS_PER_PAGE
+from profiling import stage, BuildProfiler
+from pipeline import prefetched, BoundedWriter
+
+
+PIPELINE_IO_THREADS = 4
+
+
+def generate_page(from_path, template_path, dest_path, basepath="/", source=None, write_output=None, settings=None):
+    """
+    Converts one Markdown file into an HTML page, as configured by
+    `settings` (a BuildSettings). Returns a dict with "references", the
+    (url, line) pairs of the template's and the page's links and images,
+    so the build can record which static assets the page depends on, and
+    "search", the page's search document if settings.search is set.
+
+    `source` is the file's content if it was already read. If
+    `write_output` is given, the page is rendered to a string and passed
+    to write_output(dest_path, html) instead of being written here.
+    """
+    settings = settings or BuildSettings()
+    if source is None and os.path.getsize(from_path) > settings.stream_threshold:
+        return generate_page_streaming(from_path, template_path, dest_path, basepath, settings)
 
-
-def copy_static_files(source: str, destination: str):
-    # Step 1: Delete the destination directory if it exists
-    if os.path.exists(destination):
-        shutil.rmtree(destination)
-        print(f"Deleted existing directory: {destination}")
-
-    # Step 2: Recreate the destination directory
-    os.makedirs(destination, exist_ok=True)
-    print(f"Created new directory: {destination}")
-
-    # Step 3: Recursively copy files
-    def recursive_copy(src, dst):
-        for item in os.listdir(src):
-            src_path = os.path.join(src, item)
-            dst_path = os.path.join(dst, item)
-
-            if os.path.isdir(src_path):
-                os.makedirs(dst_path, exist_ok=True)
-                recursive_copy(src_path, dst_path)
-            else:
-                shutil.copy2(src_path, dst_path)
-                print(f"Copied file: {src_path} ➜ {dst_path}")
-
-    recursive_copy(source, destination)
-
-def generate_page(from_path, template_path, dest_path, basepath="/"):
     print(f" * Generating page: {from_path} -> {dest_path}")
 
+    if source is None:
+        with stage("read"):
+            markdown_content = read_source(from_path)
+    else:
+        markdown_content = source
+
+    resolver = urls.use_basepath(basepath)
+    minifier = settings.minifier
+    with stage("template"):
+        template = load_template(template_path, resolver, minifier)
+
+    cache = settings.parse_cache
+    record = None
+    if cache is not None:
+        context = resolver.key()
+        if minifier is not None:
+            context += "\0" + minifier.key()
+        if settings.search:
+            context += "\0search"
+        cache_key = cache.key(markdown_content, context)
+        record = cache.get(cache_key)
+
+    if record is None:
+        with resolver.recording_references() as references:
+            metadata, markdown_content = split_front_matter(markdown_content)
+            node = markdown_to_html_node(markdown_content, settings.inline_cache)
+            title = normalize(metadata)["title"] or extract_title(markdown_content)
+            search = None
+            if settings.search:
+                with stage("search"):
+                    document = SearchDocument()
+                    for child in node.children:
+                        document.add_node(child)
+                    search = document.to_dict(title)
+            if cache is not None or minifier is not None:
+                with stage("render"):
+                    body = node.to_html()
+                if minifier is not None:
+                    with stage("minify"):
+                        body = minifier.minify(body)
+                if cache is not None:
+                    record = {"html": body, "title": title, "references": references, "search": search}
+                    cache.put(cache_key, record)
+                node = LeafNode(None, body)
+    else:
+        print(f"   (parse cache hit)")
+        node = LeafNode(None, record["html"])
+        title = record["title"]
+        references = record["references"]
+        search = record["search"]
+
+    def write_content(write):
+        with stage("render"):
+            node.render_to(write)
+
+    if write_output is not None:
+        chunks = []
+        with stage("template"):
+            template.render_to(chunks.append, {"Title": title, "Content": write_content})
+        write_output(dest_path, "".join(chunks))
+        return {"references": template.references + references, "search": search}
+
+    # Rendering streams into the file, so "write" only covers opening,
+    # flushing and closing it; "render" includes the buffered writes.
+    with stage("write"):
+        dest_dir_path = os.path.dirname(dest_path)
+        if dest_dir_path != "":
+            os.makedirs(dest_dir_path, exist_ok=True)
+        with open(dest_path, "w", encoding="utf-8") as to_file:
+            with stage("template"):
+                template.render_to(to_file.write, {"Title": title, "Content": write_content})
+    return {"references": template.references + references, "search": search}
+
+
+def read_source(from_path):
     with open(from_path, "r", encoding="utf-8") as from_file:
-        markdown_content = from_file.read()
-
-    with open(template_path, "r", encoding="utf-8") as template_file:
-        template = template_file.read()
-
-    node = markdown_to_html_node(markdown_content)
-    html = node.to_html()
+        return from_file.read()
 
-    title = extract_title(markdown_content)
-    template = template.replace("{{ Title }}", title)
-    template = template.replace("{{ Content }}", html)
-
-    # Replace href="/ and src="/ with href="{basepath} and src="{basepath}
-    # Note: if basepath is just '/', this will not change anything
-    if basepath != "/":
-        template = template.replace('href="/', f'href="{basepath}')
-        template = template.replace('src="/', f'src="{basepath}')
 
+def write_page(dest_path, html):
     dest_dir_path = os.path.dirname(dest_path)
     if dest_dir_path != "":
         os.makedirs(dest_dir_path, exist_ok=True)
     with open(dest_path, "w", encoding="utf-8") as to_file:
-        to_file.write(template)
+        to_file.write(html)
+
+
+def generate_page_streaming(from_path, template_path, dest_path, basepath="/", settings=None):
+    """
+    Same output as generate_page, with memory bounded by the largest block
+    rather than the file: the source is read line by line, and each block
+    is rendered straight into the output between the template's literal
+    segments and then dropped. The parse cache is not used.
+    """
+    print(f" * Generating page (streaming): {from_path} -> {dest_path}")
+
+    settings = settings or BuildSettings()
+    resolver = urls.use_basepath(basepath)
+    minifier = settings.minifier
+    with stage("template"):
+        template = load_template(template_path, resolver, minifier)
+
+    # The title comes before the content in the template, so it is found
+    # with a separate scan that stops at the first H1.
+    with stage("read"):
+        with open(from_path, "r", encoding="utf-8") as from_file:
+            metadata, lines = strip_front_matter(from_file)
+            title = normalize(metadata)["title"] or extract_title_from_lines(lines)
+
+    document = SearchDocument() if settings.search else None
+
+    def write_content(write):
+        with open(from_path, "r", encoding="utf-8") as from_file:
+            write("<div>")
+            _, lines = strip_front_matter(from_file)
+            for node in iter_block_nodes(lines, settings.inline_cache):
+                if document is not None:
+                    with stage("search"):
+                        document.add_node(node)
+                if minifier is None:
+                    with stage("render"):
+                        node.render_to(write)
+                    continue
+                with stage("render"):
+                    html = node.to_html()
+                # Every block is followed by another block-level tag or
+                # the closing </div>, which end a block alike
+                with stage("minify"):
+                    write(minifier.minify(html, followed_by="</div>"))
+            write("</div>")
+
+    with stage("write"):
+        dest_dir_path = os.path.dirname(dest_path)
+        if dest_dir_path != "":
+            os.makedirs(dest_dir_path, exist_ok=True)
+        with open(dest_path, "w", encoding="utf-8") as to_file:
+            with resolver.recording_references() as references:
+                with stage("template"):
+                    template.render_to(to_file.write, {"Title": title, "Content": write_content})
+    search = document.to_dict(title) if document is not None else None
+    return {"references": template.references + references, "search": search}
 
 
 def extract_title(md):
-    lines = md.splitlines()
+    return extract_title_from_lines(md.splitlines())
+
+
+def extract_title_from_lines(lines):
     for line in lines:
         stripped = line.lstrip()
         if stripped.startswith("# "):
@@ -72,64 +209,759 @@ def extract_title(md):
 
 
 
-def generate_pages_recursive(dir_path_content, template_path, dest_dir_path, basepath="/"):
-    print(f"Generating pages from: {dir_path_content}")
-    for root, dirs, files in os.walk(dir_path_content):
-        for file_name in files:
-            if file_name.endswith(".md"):
-                from_path = os.path.join(root, file_name)
-
-                rel_path = os.path.relpath(from_path, dir_path_content)
-                rel_path_html = os.path.splitext(rel_path)[0] + ".html"
-                dest_path = os.path.join(dest_dir_path, rel_path_html)
-
-                os.makedirs(os.path.dirname(dest_path), exist_ok=True)
-
+# The settings a worker process was started with (see _init_worker)
+_worker_settings = None
+
+
+def _init_worker(settings, resolver):
+    # Each worker process unpickles the build's settings once, at startup
+    global _worker_settings
+    _worker_settings = settings
+    urls.configure(resolver)
+
+
+def _generate_page_job(job, settings=None, profile=False, load_source=None, write_output=None):
+    # Runs in a worker process (where `settings` defaults to the ones it
+    # was started with); output is captured so the parent can print it
+    # in content order instead of completion order. The pipelined build
+    # passes `load_source`, returning the prefetched source (or None to
+    # read it here), and `write_output`.
+    settings = settings or _worker_settings
+    from_path, template_path, dest_path, basepath = job
+    buffer = io.StringIO()
+    error = None
+    page = None
+    profiler = BuildProfiler() if profile else None
+    cache = settings.parse_cache
+    cache_before = (cache.hits, cache.misses) if cache is not None else None
+    memo = settings.inline_cache
+    memo_before = (memo.hits, memo.misses) if memo is not None else None
+    previous_profiler = profiling.active()
+    profiling.activate(profiler)
+    with contextlib.redirect_stdout(buffer):
+        try:
+            with profiler.page(from_path) if profiler else contextlib.nullcontext():
                 print(f"Generating page from {from_path} to {dest_path}")
-                generate_page(from_path, template_path, dest_path, basepath)
-
-
-
-
-def copy_files_recursive(source_dir_path, dest_dir_path):
-    if not os.path.exists(dest_dir_path):
-        os.mkdir(dest_dir_path)
-
-    for filename in os.listdir(source_dir_path):
-        from_path = os.path.join(source_dir_path, filename)
-        dest_path = os.path.join(dest_dir_path, filename)
-        print(f" * {from_path} -> {dest_path}")
-        if os.path.isfile(from_path):
-            shutil.copy(from_path, dest_path)
+                source = load_source() if load_source is not None else None
+                page = generate_page(from_path, template_path, dest_path, basepath, source, write_output, settings)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            traceback.print_exc(file=buffer)
+        finally:
+            profiling.activate(previous_profiler)
+    page_stages = profiler.pages.get(from_path) if profiler else None
+    cache_stats = None
+    if cache is not None:
+        cache_stats = (cache.hits - cache_before[0], cache.misses - cache_before[1])
+    memo_stats = None
+    if memo is not None:
+        memo_stats = (memo.hits - memo_before[0], memo.misses - memo_before[1])
+    return {
+        "output": buffer.getvalue(),
+        "error": error,
+        "stages": page_stages,
+        "cache": cache_stats,
+        "inline_cache": memo_stats,
+        "page": page,
+    }
+
+
+def _prefetch_source(job, stream_threshold):
+    # Large sources are left to generate_page, which streams them
+    from_path = job[0]
+    if os.path.getsize(from_path) > stream_threshold:
+        return None
+    return read_source(from_path)
+
+
+def run_pipelined(page_jobs, job_func, depth, stream_threshold=DEFAULT_STREAM_THRESHOLD):
+    """
+    Runs job_func for every job in order on this thread, while I/O
+    threads read the sources of the next `depth` pages ahead of it and
+    write finished pages behind it, at most `depth` in flight. Waiting on
+    slow storage (e.g. NFS) then overlaps with parsing and rendering.
+    Returns the job results, with write failures reported as errors.
+    """
+    results = []
+    prefetch = functools.partial(_prefetch_source, stream_threshold=stream_threshold)
+    with ThreadPoolExecutor(max_workers=PIPELINE_IO_THREADS) as io_pool:
+        writer = BoundedWriter(io_pool, depth)
+        for index, (job, source) in enumerate(prefetched(page_jobs, prefetch, io_pool, depth)):
+            def write_output(dest_path, html, index=index):
+                writer.submit(index, write_page, dest_path, html)
+            results.append(job_func(job, load_source=source.result, write_output=write_output))
+        for index, error in writer.wait():
+            result = results[index]
+            result["error"] = f"{type(error).__name__}: {error}"
+            result["output"] += f"Error writing {page_jobs[index][2]}: {result['error']}\n"
+    return results
+
+
+def run_page_jobs(page_jobs, jobs=1, settings=None):
+    """
+    Generates every (from_path, template_path, dest_path, basepath) job
+    with `settings`, serially (pipelined with I/O threads if
+    settings.pipeline_depth is set) or across `jobs` worker processes.
+    Logs are printed in job order either way. Returns (failures, pages):
+    a list of (from_path, error) for failed pages, and a dict mapping
+    each built page's from_path to what generate_page returned for it.
+    """
+    settings = settings or BuildSettings()
+    profiler = profiling.active()
+    cache = settings.parse_cache
+    memo = settings.inline_cache
+    if jobs > 1 and len(page_jobs) > 1:
+        job_func = functools.partial(_generate_page_job, profile=profiler is not None)
+        with ProcessPoolExecutor(
+            max_workers=min(jobs, len(page_jobs)),
+            initializer=_init_worker,
+            initargs=(settings, urls.active()),
+        ) as executor:
+            results = executor.map(job_func, page_jobs, chunksize=max(1, len(page_jobs) // (jobs * 4)))
+            results = list(results)
+    else:
+        job_func = functools.partial(_generate_page_job, settings=settings, profile=profiler is not None)
+        if settings.pipeline_depth > 0 and len(page_jobs) > 1:
+            results = run_pipelined(page_jobs, job_func, settings.pipeline_depth, settings.stream_threshold)
         else:
-            copy_files_recursive(from_path, dest_path)
-
+            results = map(job_func, page_jobs)
+
+    failures = []
+    pages = {}
+    cache_hits = cache_misses = 0
+    memo_hits = memo_misses = 0
+    for job, result in zip(page_jobs, results):
+        print(result["output"], end="")
+        if profiler is not None and result["stages"] is not None:
+            profiler.add_page(job[0], result["stages"])
+        if result["cache"] is not None:
+            cache_hits += result["cache"][0]
+            cache_misses += result["cache"][1]
+        if result["inline_cache"] is not None:
+            memo_hits += result["inline_cache"][0]
+            memo_misses += result["inline_cache"][1]
+        if result["error"] is not None:
+            failures.append((job[0], result["error"]))
+        else:
+            pages[job[0]] = result["page"]
+    if cache is not None:
+        print(f"Parse cache: {cache_hits} hit(s), {cache_misses} miss(es)")
+    if memo is not None:
+        print(f"Inline cache: {memo_hits} hit(s), {memo_misses} miss(es)")
+    return failures, pages
+
+
+def asset_dependencies(references, static_dir):
+    """
+    Maps the root-relative URLs a page referenced to the static files
+    they point at. Links to other pages or external URLs are ignored.
+    """
+    paths = []
+    for url, _ in references:
+        if not url.startswith("/") or url.startswith("//"):
+            continue
+        url_path = url.split("#", 1)[0].split("?", 1)[0]
+        path = os.path.join(static_dir, *url_path.split("/"))
+        if os.path.isfile(path) and path not in paths:
+            paths.append(path)
+    return paths
+
+
+def template_dependencies(template_path, minifier=None):
+    """
+    The files a page rendered with `template_path` depends on: the
+    template and every partial it includes. If the template can't be
+    loaded, just the template; its pages then fail with the error.
+    """
+    try:
+        return load_template(template_path, minifier=minifier).files
+    except (OSError, ValueError):
+        return [template_path]
+
+
+def page_metadata(from_path):
+    # A source that can't be read is left for its page job to report
+    try:
+        return scan_metadata(from_path)
+    except (OSError, ValueError):
+        return normalize({})
+
+
+def generate_pages_recursive(
+    dir_path_content,
+    template_path,
+    dest_dir_path,
+    basepath="/",
+    manifest=None,
+    jobs=1,
+    static_dir=None,
+    explain=False,
+    link_index=None,
+    search_documents=None,
+    only_pages=None,
+    metadata_index=None,
+    settings=None,
+):
+    """
+    Generates a page for every Markdown file under dir_path_content,
+    with the nearest _template.html in its directory or a parent one, or
+    else `template_path`. With a manifest, pages whose source, template
+    and its partials, and referenced static assets (found under
+    `static_dir`) are unchanged are skipped, and `explain` prints why
+    each of the other pages is rebuilt. Every page, and the
+    internal links it contains, is added to `link_index` if given, and
+    its search document to the `search_documents` dict (keyed by page
+    URL); those of skipped pages come from the manifest. With a manifest
+    and `only_pages`, a set of absolute source paths, every other page
+    is left as it is without being checked.
+
+    Only the head of each source is read up front, for its metadata:
+    drafts are skipped unless settings.include_drafts is set, and the
+    metadata of every other page goes into the `metadata_index` dict if
+    given (keyed by page URL).
+    """
+    print(f"Generating pages from: {dir_path_content}")
+    settings = settings or BuildSettings()
+    resolver = urls.use_basepath(basepath)
+    minifier = settings.minifier
+    # Settings that change pages' output, recorded with each page
+    output_settings = {
+        "fingerprint": bool(resolver.assets),
+        "minify": minifier.key() if minifier else None,
+        "search": settings.search,
+    }
+    skipped = 0
+    page_jobs = []
+    entries = []
+    with stage("walk"):
+        for root, dirs, files in os.walk(dir_path_content):
+            dirs.sort()
+            page_template = find_template(root, dir_path_content, template_path)
+            template_files = template_dependencies(page_template, minifier)
+            for file_name in sorted(files):
+                if file_name.endswith(".md"):
+                    from_path = os.path.join(root, file_name)
+
+                    rel_path = os.path.relpath(from_path, dir_path_content)
+                    rel_path_html = os.path.splitext(rel_path)[0] + ".html"
+                    dest_path = os.path.join(dest_dir_path, rel_path_html)
+
+                    metadata = page_metadata(from_path)
+                    if metadata["draft"] and not settings.include_drafts:
+                        print(f" * Skipping draft: {rel_path}")
+                        continue
+                    if metadata_index is not None:
+                        metadata_index[page_url(rel_path_html)] = metadata
+
+                    entry = None
+                    if manifest is not None:
+                        if only_pages is not None and os.path.abspath(from_path) not in only_pages:
+                            # Not asked for: keep what the last build left
+                            manifest.seen.add(rel_path)
+                            reasons = None
+                        else:
+                            reasons, entry = manifest.check_page(
+                                rel_path, from_path, basepath, dest_path, template_files, output_settings
+                            )
+                        if not reasons:
+                            old = manifest.pages.get(rel_path)
+                            if old is None:
+                                continue  # never built, and not asked for
+                            skipped += 1
+                            if link_index is not None:
+                                link_index.add_page(from_path, rel_path_html, old.get("links", []))
+                            if search_documents is not None and old.get("search"):
+                                search_documents[resolver.resolve(page_url(rel_path_html))] = old["search"]
+                            continue
+                        if explain:
+                            print(f" * Rebuilding {rel_path}: {'; '.join(reasons)}")
+
+                    page_jobs.append((from_path, page_template, dest_path, basepath))
+                    entries.append((rel_path, rel_path_html, entry, template_files))
+
+    failures, pages = run_page_jobs(page_jobs, jobs, settings)
+
+    for (from_path, _, _, _), (rel_path, rel_path_html, entry, template_files) in zip(page_jobs, entries):
+        page = pages.get(from_path)
+        if page is None:
+            continue
+        references = page["references"]
+        links = [(url, line) for url, line in references if internal_path(url) is not None]
+        if link_index is not None:
+            link_index.add_page(from_path, rel_path_html, links)
+        if search_documents is not None and page["search"] is not None:
+            search_documents[resolver.resolve(page_url(rel_path_html))] = page["search"]
+        if manifest is not None:
+            dependencies = list(template_files)
+            if static_dir is not None:
+                dependencies += asset_dependencies(references, static_dir)
+            entry["links"] = links
+            entry["search"] = page["search"]
+            manifest.record_page(rel_path, entry, dependencies)
+
+    if manifest is not None:
+        for removed_path in manifest.remove_stale():
+            print(f" * Removed stale page: {removed_path}")
+        print(f"Skipped {skipped} unchanged page(s)")
+
+    if failures:
+        summary = "\n".join(f"  {from_path}: {error}" for from_path, error in failures)
+        raise RuntimeError(f"{len(failures)} of {len(page_jobs)} page(s) failed to build:\n{summary}")
+
+
+def generate_listing_pages(
+    metadata_index,
+    dir_path_content,
+    template_path,
+    dest_dir_path,
+    basepath="/",
+    manifest=None,
+    link_index=None,
+    settings=None,
+):
+    """
+    Writes the paginated index of the posts under settings.blog_dir and
+    the tag pages, from `metadata_index` alone, with the template the
+    posts' directory uses. Pages whose HTML is unchanged are not
+    rewritten, and with a manifest, listing pages no longer generated
+    are removed. A Markdown page at the same URL as a listing page takes
+    precedence.
+    """
+    settings = settings or BuildSettings()
+    resolver = urls.use_basepath(basepath)
+    listings = []
+    if settings.blog_dir is not None:
+        blog_path = os.path.join(dir_path_content, settings.blog_dir)
+        blog_url = page_url(os.path.join(os.path.relpath(blog_path, dir_path_content), "index.html"))
+        blog_title = os.path.basename(os.path.normpath(blog_path)).replace("-", " ").capitalize()
+        listings = listing_pages(metadata_index, blog_url, blog_title, settings.posts_per_page)
+        template = load_template(
+            find_template(blog_path, dir_path_content, template_path), resolver, settings.minifier
+        )
+
+    outputs = []
+    written = 0
+    for listing in listings:
+        if listing.url in metadata_index:
+            print(f"Warning: {listing.url} is a page of its own; listing not written")
+            continue
+        rel_path_html = listing.url[1:] + "index.html"
+        with resolver.recording_references() as references:
+            content = listing.render(resolver.resolve)
+        html = template.render({"Title": listing.page_title(), "Content": content})
+        dest_path = os.path.join(dest_dir_path, rel_path_html)
+        try:
+            with open(dest_path, "r", encoding="utf-8") as f:
+                unchanged = f.read() == html
+        except OSError:
+            unchanged = False
+        if not unchanged:
+            write_page(dest_path, html)
+            written += 1
+        outputs.append(dest_path)
+        if link_index is not None:
+            link_index.add_page(dest_path, rel_path_html, template.references + references)
+
+    if manifest is not None:
+        # A page that now has a listing's URL has just been written there
+        pages = {entry["dest"] for entry in manifest.pages.values()}
+        for dest_path in sorted(set(manifest.listings) - set(outputs) - pages):
+            if os.path.isfile(dest_path):
+                os.remove(dest_path)
+                print(f" * Removed stale listing page: {dest_path}")
+                try:
+                    os.removedirs(os.path.dirname(dest_path))  # e.g. page/3/, then page/
+                except OSError:
+                    pass  # directory still holds other outputs
+        manifest.listings = outputs
+    if listings:
+        print(f"Listing pages: {len(outputs)} page(s), {written} written")
+
+
+# rest of your setup paths
+dir_path_static = "./static"
+dir_path_public = "./docs"
+dir_path_content = "./content"
+template_path = "./template.html"
+dir_path_partials = "./partials"  # conventional place for {{ include "..." }} files
+
+
+def build_site(
+    basepath="/",
+    incremental=False,
+    jobs=1,
+    sync_static=False,
+    hash_static=False,
+    explain=False,
+    gzip_level=None,
+    gzip_min_size=precompress.DEFAULT_MIN_SIZE,
+    fingerprint=False,
+    strict=False,
+    only_pages=None,
+    settings=None,
+):
+    """
+    Builds the whole site into dir_path_public. With `incremental`, the
+    existing output and its manifest are reused so only changed pages are
+    regenerated; `explain` prints why each of them was. `only_pages`
+    further limits an incremental build to those source files. With
+    `sync_static` (implied by `incremental`), the output directory is
+    not wiped and static files are synced instead of copied.
+
+    With a `gzip_level`, text outputs of at least `gzip_min_size` bytes
+    also get a precompressed .gz sibling. With `fingerprint`, static
+    files are published under content-hashed names and links to them
+    rewritten. Internal links to pages or static files that don't exist
+    are reported, and fail the build with `strict`. Pages are built as
+    `settings` (a BuildSettings) says: with settings.search, a
+    client-side search index is also written under search/, and with
+    settings.blog_dir, listing pages of its posts. Raises RuntimeError if
+    any page fails.
+    """
+    settings = settings or BuildSettings()
+    manifest_path = os.path.join(dir_path_public, MANIFEST_NAME)
+    sync_static = sync_static or incremental
+
+    if sync_static and os.path.exists(manifest_path):
+        manifest = BuildManifest.load(manifest_path)
+        # Without --incremental every page is regenerated, but the old
+        # manifest still tells us which outputs and static files are stale
+        manifest.force = not incremental
+    else:
+        # A full build still writes a manifest so the next run can be incremental
+        print("Deleting public directory...")
+        if os.path.exists(dir_path_public):
+            shutil.rmtree(dir_path_public)
+        manifest = BuildManifest(manifest_path)
 
+    print("Copying static files to public directory...")
+    with stage("static_copy"):
+        manifest.static, stats = sync_static_files(
+            dir_path_static, dir_path_public, manifest.static, hash_static, fingerprint
+        )
+    print(f"Static files: {stats['copied']} copied, {stats['unchanged']} unchanged, {stats['removed']} removed")
+
+    assets = asset_map(manifest.static)
+    urls.configure(urls.UrlResolver(basepath, assets))
+    asset_manifest_path = os.path.join(dir_path_public, ASSET_MANIFEST_NAME)
+    if fingerprint:
+        write_asset_manifest(assets, dir_path_public)
+    elif os.path.exists(asset_manifest_path):
+        os.remove(asset_manifest_path)
 
-def main():
-    basepath = "/"
-    if len(sys.argv) > 1:
-        basepath = sys.argv[1]
-        if not basepath.endswith("/"):
-            basepath += "/"
+    print("Generating content...")
+    link_index = LinkIndex()
+    search_documents = {} if settings.search else None
+    metadata_index = {}
+    for rel_path in manifest.static:
+        link_index.add_target("/" + rel_path.replace(os.sep, "/"))
+    try:
+        generate_pages_recursive(
+            dir_path_content,
+            template_path,
+            dir_path_public,
+            basepath,
+            manifest,
+            jobs,
+            static_dir=dir_path_static,
+            explain=explain,
+            link_index=link_index,
+            search_documents=search_documents,
+            only_pages=only_pages if incremental else None,
+            metadata_index=metadata_index,
+            settings=settings,
+        )
+        with stage("listings"):
+            generate_listing_pages(
+                metadata_index, dir_path_content, template_path, dir_path_public, basepath, manifest, link_index,
+                settings,
+            )
+        with stage("link_check"):
+            broken = link_index.broken()
+        for source_path, line, url in broken:
+            location = f"{source_path}:{line}" if line is not None else f"{source_path} (template)"
+            print(f"Broken link: {location}: {url}")
+        if broken and strict:
+            raise RuntimeError(f"{len(broken)} broken link(s)")
+        if search_documents is not None:
+            with stage("search_index"):
+                stats = write_search_index(search_documents, dir_path_public)
+            print(f"Search index: {len(search_documents)} page(s), {stats['written']} file(s) written, "
+                  f"{stats['unchanged']} unchanged, {stats['removed']} removed")
+        if gzip_level is not None:
+            print("Precompressing output...")
+            with stage("precompress"):
+                published = [entry.get("output", rel_path) for rel_path, entry in manifest.static.items()]
+                manifest.compressed, stats = precompress.precompress_tree(
+                    dir_path_public, gzip_level, gzip_min_size, jobs, manifest.compressed, published
+                )
+            print(f"Precompressed: {stats['compressed']} written, {stats['unchanged']} unchanged, {stats['removed']} removed")
+        elif manifest.compressed:
+            # Precompression was turned off: drop what the last build wrote
+            with stage("precompress"):
+                published = [entry.get("output", rel_path) for rel_path, entry in manifest.static.items()]
+                removed = precompress.remove_compressed(dir_path_public, manifest.compressed, published)
+            manifest.compressed = []
+            print(f"Removed {removed} precompressed file(s)")
+    finally:
+        manifest.save()
+        cache = settings.parse_cache
+        if cache is not None:
+            evicted = cache.trim()
+            if evicted:
+                print(f"Evicted {evicted} parse cache entr{'y' if evicted == 1 else 'ies'}")
+
+
+def daemon_pages(paths):
+    """
+    The source pages a daemon build request is limited to: the requested
+    paths if they are all Markdown files under dir_path_content,
+    otherwise None (a normal incremental build, e.g. for a template or
+    static file change).
+    """
+    if not paths:
+        return None
+    content_root = os.path.join(os.path.abspath(dir_path_content), "")
+    pages = {os.path.abspath(path) for path in paths}
+    if all(path.endswith(".md") and path.startswith(content_root) for path in pages):
+        return pages
+    return None
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Build the static site from ./content into ./docs.")
+    parser.add_argument("basepath", nargs="?", default="/", help="URL prefix the site is served under")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="keep the existing output and only regenerate pages whose inputs changed",
+    )
+    parser.add_argument(
+        "--sync-static",
+        action="store_true",
+        help="don't wipe the output; copy only new or changed static files and remove stale ones",
+    )
+    parser.add_argument(
+        "--hash-static",
+        action="store_true",
+        help="with --sync-static/--incremental, compare static files by content hash when mtimes differ",
+    )
+    parser.add_argument(
+        "--fingerprint",
+        action="store_true",
+        help=f"publish static files under content-hashed names, rewrite links to them and write {ASSET_MANIFEST_NAME}",
+    )
+    parser.add_argument(
+        "--search",
+        action="store_true",
+        help="write a client-side search index, sharded by term prefix, under search/",
+    )
+    parser.add_argument(
+        "--blog",
+        nargs="?",
+        const="blog",
+        metavar="DIR",
+        help="write a paginated index of the posts under content/DIR, newest first by front-matter "
+        "date, and a page per tag (default: blog)",
+    )
+    parser.add_argument(
+        "--per-page",
+        type=int,
+        default=DEFAULT_POSTS_PER_PAGE,
+        metavar="N",
+        help=f"posts per listing page for --blog (default: {DEFAULT_POSTS_PER_PAGE})",
+    )
+    parser.add_argument(
+        "--drafts",
+        action="store_true",
+        help="also build pages marked \"draft: true\" in their front matter",
+    )
+    parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="fail the build if any internal link or image points to a missing page or static file",
+    )
+    parser.add_argument(
+        "--explain",
+        action="store_true",
+        help="print why each page is rebuilt (its source, template or a referenced static file changed)",
+    )
+    parser.add_argument(
+        "--minify",
+        action="store_true",
+        help="strip comments and collapse whitespace in the template and pages (<pre>/<code> are kept as is)",
+    )
+    parser.add_argument(
+        "--drop-optional-tags",
+        action="store_true",
+        help="with --minify, also omit end tags HTML makes optional, such as </li> and </p>",
+    )
+    parser.add_argument(
+        "--gzip",
+        action="store_true",
+        help="also write precompressed .gz copies of HTML, CSS and other text outputs",
+    )
+    parser.add_argument(
+        "--gzip-level",
+        type=int,
+        choices=range(1, 10),
+        default=precompress.DEFAULT_LEVEL,
+        metavar="LEVEL",
+        help=f"zlib compression level for --gzip, 1-9 (default: {precompress.DEFAULT_LEVEL})",
+    )
+    parser.add_argument(
+        "--gzip-min-size",
+        type=int,
+        default=precompress.DEFAULT_MIN_SIZE,
+        metavar="BYTES",
+        help=f"don't precompress files smaller than this (default: {precompress.DEFAULT_MIN_SIZE})",
+    )
+    parser.add_argument(
+        "--parse-cache",
+        nargs="?",
+        const=".cache/parse",
+        metavar="DIR",
+        help="reuse parsed pages from an on-disk cache keyed by content hash (default: .cache/parse)",
+    )
+    parser.add_argument(
+        "--parse-cache-size",
+        type=int,
+        default=256,
+        metavar="MB",
+        help="evict least recently used cache entries beyond this size (default: 256)",
+    )
+    parser.add_argument(
+        "--inline-cache",
+        nargs="?",
+        type=int,
+        const=inline_cache.DEFAULT_MAX_ENTRIES,
+        default=0,
+        metavar="ENTRIES",
+        help="memoize the rendering of inline text that repeats across blocks and pages, keeping "
+        f"up to ENTRIES fragments per process (default: {inline_cache.DEFAULT_MAX_ENTRIES})",
+    )
+    parser.add_argument(
+        "--stream-threshold",
+        type=float,
+        default=DEFAULT_STREAM_THRESHOLD / (1024 * 1024),
+        metavar="MB",
+        help="convert sources larger than this line by line with bounded memory (default: 16)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="number of worker processes for page generation (0 = one per CPU core)",
+    )
+    parser.add_argument(
+        "--pipeline",
+        nargs="?",
+        type=int,
+        const=16,
+        default=0,
+        metavar="DEPTH",
+        help="without -j, read sources and write pages on I/O threads up to DEPTH pages ahead of "
+        "the parser, for slow (e.g. network) storage (default: 16)",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="serve the output, rebuild incrementally on changes and live-reload open browsers",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="build-profile.json",
+        metavar="REPORT",
+        help="time each build stage per page and write a JSON report (default: build-profile.json)",
+    )
+    parser.add_argument(
+        "--daemon",
+        nargs="?",
+        const=".cache/build.sock",
+        metavar="SOCKET",
+        help="stay running and build on requests from src/build_client.py over a Unix socket "
+        "(default: .cache/build.sock)",
+    )
+    parser.add_argument("--port", type=int, default=8888, help="port for --watch (default: 8888)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    basepath = args.basepath
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    if not basepath.endswith("/"):
+        basepath += "/"
 
     print(f"Using basepath: {basepath}")
 
-    # rest of your setup paths
-    dir_path_static = "./static"
-    dir_path_public = "./docs"
-    dir_path_content = "./content"
-    template_path = "./template.html"
-
-    print("Deleting public directory...")
-    if os.path.exists(dir_path_public):
-        shutil.rmtree(dir_path_public)
-
-    print("Copying static files to public directory...")
-    copy_files_recursive(dir_path_static, dir_path_public)
-
-    print("Generating content...")
-    generate_pages_recursive(dir_path_content, template_path, dir_path_public, basepath)
+    settings = BuildSettings(
+        stream_threshold=int(args.stream_threshold * 1024 * 1024),
+        search=args.search,
+        pipeline_depth=args.pipeline,
+        blog_dir=args.blog,
+        posts_per_page=max(1, args.per_page),
+        include_drafts=args.drafts,
+    )
+    if args.minify or args.drop_optional_tags:
+        settings.minifier = HtmlMinifier(args.drop_optional_tags)
+    if args.inline_cache > 0:
+        settings.inline_cache = InlineCache(args.inline_cache)
+    if args.parse_cache:
+        settings.parse_cache = ParseCache(args.parse_cache, args.parse_cache_size * 1024 * 1024)
+
+    def build(incremental, only_pages=None):
+        build_site(
+            basepath=basepath,
+            incremental=incremental,
+            jobs=jobs,
+            sync_static=args.sync_static,
+            hash_static=args.hash_static,
+            explain=args.explain,
+            gzip_level=args.gzip_level if args.gzip else None,
+            gzip_min_size=args.gzip_min_size,
+            fingerprint=args.fingerprint,
+            strict=args.strict,
+            only_pages=only_pages,
+            settings=settings,
+        )
+
+    if args.watch:
+        from devserver import watch_and_serve
+        watch_and_serve(
+            build,
+            [dir_path_content, dir_path_static, template_path, dir_path_partials],
+            dir_path_public,
+            basepath,
+            args.port,
+        )
+        return
+
+    if args.daemon:
+        from daemon import serve
+        if settings.parse_cache is None:
+            settings.parse_cache = MemoryParseCache(args.parse_cache_size * 1024 * 1024)
+        serve(lambda paths: build(True, daemon_pages(paths)), args.daemon)
+        return
+
+    profiler = None
+    if args.profile:
+        profiler = BuildProfiler()
+        profiling.activate(profiler)
+
+    try:
+        build(args.incremental)
+    except RuntimeError as e:
+        print(f"Build failed: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        if profiler is not None:
+            profiling.activate(None)
+            profiler.print_summary()
+            profiler.write_report(args.profile)
+            print(f"Wrote profile report to {args.profile}")
 
 if __name__ == "__main__":
     main()
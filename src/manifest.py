@@ -0,0 +1,191 @@
+import hashlib
+import json
+import os
+
+MANIFEST_NAME = ".build-manifest.json"
+MANIFEST_VERSION = 3
+
+
+def hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BuildManifest:
+    """
+    Records, for every generated page, the inputs it was built from:
+    source content hash, basepath, output path and the hashes of the
+    files it depends on (its template and the static assets it
+    references). Stored as JSON next to the output so the next build can
+    skip pages whose inputs are unchanged and say why the others were
+    rebuilt.
+    """
+
+    def __init__(self, path, pages=None, static=None, files=None, listings=None, compressed=None):
+        self.path = path
+        self.pages = pages or {}   # source key -> entry dict
+        self.static = static or {} # static file -> state from sync_static_files
+        self.files = files or {}   # dependency path -> {"size", "mtime", "hash"}
+        self.listings = listings or []  # outputs of generated listing pages
+        self.compressed = compressed or []  # .gz files written by --gzip
+        self.seen = set()          # source keys visited during this build
+        self.force = False         # treat every page as changed
+        self._hashes = {}          # dependency path -> hash, checked this build
+
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls(path)
+        if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+            return cls(path)
+        return cls(
+            path,
+            data.get("pages", {}),
+            data.get("static", {}),
+            data.get("files", {}),
+            data.get("listings", []),
+            data.get("compressed", []),
+        )
+
+    def save(self):
+        # Only keep signatures of files some page still depends on
+        used = set()
+        for entry in self.pages.values():
+            used.update(entry.get("deps", ()))
+        self.files = {dep: sig for dep, sig in self.files.items() if dep in used}
+
+        data = {
+            "version": MANIFEST_VERSION,
+            "pages": self.pages,
+            "static": self.static,
+            "files": self.files,
+            "listings": self.listings,
+            "compressed": self.compressed,
+        }
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def file_hash(self, path):
+        """
+        Content hash of a dependency, or None if it no longer exists. Each
+        file is checked at most once per build, and only rehashed when
+        its size or mtime differs from the recorded signature.
+        """
+        if path in self._hashes:
+            return self._hashes[path]
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self.files.pop(path, None)
+            self._hashes[path] = None
+            return None
+        old = self.files.get(path)
+        if old and old["size"] == stat.st_size and old["mtime"] == stat.st_mtime_ns:
+            file_hash = old["hash"]
+        else:
+            file_hash = hash_file(path)
+            self.files[path] = {"size": stat.st_size, "mtime": stat.st_mtime_ns, "hash": file_hash}
+        self._hashes[path] = file_hash
+        return file_hash
+
+    def check_page(self, key, source_path, basepath, dest_path, dependencies=(), settings=None):
+        """
+        Returns (reasons, entry). `reasons` lists why the page must be
+        rebuilt and is empty if it is up to date. `dependencies` are files
+        the page is known to depend on before it is built (its template);
+        those found while building it are passed to `record_page`.
+        `settings` holds other build options that change the output.
+        `entry` describes the page's current inputs and should be passed
+        to `record_page` once the page is written. Size and mtime are used
+        as a shortcut; the content hash is only recomputed when they differ.
+        """
+        self.seen.add(key)
+        stat = os.stat(source_path)
+        old = self.pages.get(key)
+
+        if old and old.get("size") == stat.st_size and old.get("mtime") == stat.st_mtime_ns:
+            source_hash = old["source_hash"]
+        else:
+            source_hash = hash_file(source_path)
+
+        # What the last build recorded about the page (its dependencies,
+        # links, ...) is carried over in case it is skipped this time
+        entry = dict(old) if old else {"deps": {}}
+        entry.update({
+            "source_hash": source_hash,
+            "basepath": basepath,
+            "settings": settings or {},
+            "dest": dest_path,
+            "size": stat.st_size,
+            "mtime": stat.st_mtime_ns,
+        })
+
+        if self.force:
+            return ["forced"], entry
+        if old is None:
+            return ["new page"], entry
+
+        reasons = []
+        if not os.path.exists(dest_path):
+            reasons.append("output missing")
+        if old.get("source_hash") != source_hash:
+            reasons.append("source changed")
+        if old.get("basepath") != basepath:
+            reasons.append("basepath changed")
+        if old.get("settings", {}) != entry["settings"]:
+            reasons.append("build settings changed")
+        if old.get("dest") != dest_path:
+            reasons.append("output path changed")
+        for dep in dependencies:
+            if dep not in entry["deps"]:
+                reasons.append(f"new dependency: {dep}")
+        for dep, dep_hash in sorted(entry["deps"].items()):
+            current = self.file_hash(dep)
+            if current is None:
+                reasons.append(f"dependency removed: {dep}")
+            elif current != dep_hash:
+                reasons.append(f"dependency changed: {dep}")
+
+        if not reasons:
+            # Refresh size/mtime so a touched-but-identical file is cheap next time
+            self.pages[key] = entry
+        return reasons, entry
+
+    def record_page(self, key, entry, dependencies=()):
+        """
+        Stores a freshly built page, with the hashes of the files it
+        depends on. Dependencies that don't exist are not recorded.
+        """
+        self.seen.add(key)
+        deps = {}
+        for dep in dependencies:
+            dep_hash = self.file_hash(dep)
+            if dep_hash is not None:
+                deps[dep] = dep_hash
+        entry["deps"] = deps
+        self.pages[key] = entry
+
+    def remove_stale(self):
+        """
+        Deletes outputs of sources that were not seen during this build
+        and drops them from the manifest. Returns the removed output paths.
+        """
+        removed = []
+        for key in sorted(set(self.pages) - self.seen):
+            dest_path = self.pages.pop(key)["dest"]
+            if os.path.isfile(dest_path):
+                os.remove(dest_path)
+                removed.append(dest_path)
+                try:
+                    os.rmdir(os.path.dirname(dest_path))
+                except OSError:
+                    pass  # directory still holds other outputs
+        return removed
@@ -0,0 +1,131 @@
+import re
+
+TOKEN_PATTERN = re.compile(r"(<!--.*?-->|<[!/]?[A-Za-z][^>]*>)", re.DOTALL)
+TAG_NAME_PATTERN = re.compile(r"</?!?([A-Za-z][A-Za-z0-9-]*)")
+WHITESPACE_PATTERN = re.compile(r"[ \t\n\r\f]+")
+
+# Content of these elements is copied exactly as written
+PRESERVE_TAGS = {"pre", "code", "textarea", "script", "style"}
+
+# Whitespace next to these tags is never rendered, so it can be dropped
+BLOCK_TAGS = {
+    "doctype", "html", "head", "body", "title", "meta", "link", "base", "style", "script",
+    "article", "aside", "blockquote", "br", "dd", "details", "div", "dl", "dt", "fieldset",
+    "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header",
+    "hr", "li", "main", "nav", "ol", "p", "pre", "section", "summary", "table", "tbody",
+    "td", "tfoot", "th", "thead", "tr", "ul",
+}
+
+# Start tags that implicitly close an open <p>
+P_CLOSERS = {
+    "address", "article", "aside", "blockquote", "details", "div", "dl", "fieldset",
+    "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header",
+    "hr", "main", "menu", "nav", "ol", "p", "pre", "section", "table", "ul",
+}
+
+# For each end tag that HTML lets us omit, the start tags that may follow
+# it. Any end tag (the parent closing) may follow as well, except as noted
+# in _can_omit_end_tag.
+OPTIONAL_END_TAGS = {
+    "li": {"li"},
+    "p": P_CLOSERS,
+    "dt": {"dt", "dd"},
+    "dd": {"dt", "dd"},
+    "tr": {"tr"},
+    "td": {"td", "th"},
+    "th": {"td", "th"},
+    "option": {"option", "optgroup"},
+}
+
+class HtmlMinifier:
+    """
+    Shrinks HTML without changing how it renders: comments are removed,
+    runs of whitespace collapse to one space and whitespace next to block
+    level tags is dropped. The content of <pre>, <code>, <textarea>,
+    <script> and <style> is left exactly as it is. With
+    `drop_optional_tags`, end tags HTML allows to be omitted (</li>,
+    </p>, </body>, ...) are removed as well.
+    """
+
+    def __init__(self, drop_optional_tags=False):
+        self.drop_optional_tags = drop_optional_tags
+
+    def key(self):
+        # Identifies the minifier's configuration, for cache keys
+        return "minify+tags" if self.drop_optional_tags else "minify"
+
+    def minify(self, html, followed_by=""):
+        """
+        Returns the minified `html`. For a fragment of a larger document,
+        `followed_by` is markup known to come next (e.g. "</div>"); it is
+        used to decide what can be dropped at the end of the fragment but
+        is not part of the result.
+        """
+        lookahead = self._tokenize(followed_by)
+        tokens = self._trim_whitespace(self._tokenize(html) + lookahead)
+        end = len(tokens) - len(lookahead)
+        parts = []
+        for i in range(end):
+            token = tokens[i]
+            if self.drop_optional_tags and token[2]:
+                if _can_omit_end_tag(token[1], tokens[i + 1] if i + 1 < len(tokens) else None):
+                    continue
+            parts.append(token[0])
+        return "".join(parts)
+
+    def _tokenize(self, html):
+        # Tokens are (text, tag name, is end tag, verbatim); text tokens
+        # have no tag name.
+        tokens = []
+        preserved = 0
+        for i, piece in enumerate(TOKEN_PATTERN.split(html)):
+            if i % 2 == 0:
+                if piece:
+                    if preserved:
+                        tokens.append((piece, None, False, True))
+                    else:
+                        tokens.append((WHITESPACE_PATTERN.sub(" ", piece), None, False, False))
+                continue
+            if piece.startswith("<!--"):
+                # Conditional comments are markup for old browsers, keep them
+                if preserved or piece.startswith("<!--["):
+                    tokens.append((piece, None, False, True))
+                continue
+            name = TAG_NAME_PATTERN.match(piece).group(1).lower()
+            closing = piece.startswith("</")
+            if name in PRESERVE_TAGS and not piece.endswith("/>"):
+                preserved = max(0, preserved - 1) if closing else preserved + 1
+            tokens.append((piece, name, closing, preserved > 0))
+        return tokens
+
+    def _trim_whitespace(self, tokens):
+        result = []
+        for i, token in enumerate(tokens):
+            text, name, closing, verbatim = token
+            if name is not None or verbatim:
+                result.append(token)
+                continue
+            previous = tokens[i - 1] if i > 0 else None
+            following = tokens[i + 1] if i + 1 < len(tokens) else None
+            if previous is None or previous[1] in BLOCK_TAGS:
+                text = text.lstrip(" ")
+            if following is None or following[1] in BLOCK_TAGS:
+                text = text.rstrip(" ")
+            if text:
+                result.append((text, name, closing, verbatim))
+        return result
+
+
+def _can_omit_end_tag(name, following):
+    if name in ("html", "head", "body"):
+        # Allowed unless followed by text or a comment, which would then
+        # end up inside the wrong element
+        return following is None or following[1] is not None
+    followers = OPTIONAL_END_TAGS.get(name)
+    if followers is None or following is None or following[1] is None:
+        return False
+    if following[2]:
+        # The parent is closing. A <p> inside an <a> (and a few others)
+        # must still be closed explicitly.
+        return not (name == "p" and following[1] in ("a", "audio", "del", "ins", "map", "noscript", "video"))
+    return following[1] in followers
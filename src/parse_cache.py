@@ -0,0 +1,137 @@
+import hashlib
+import json
+import os
+import zlib
+from collections import OrderedDict
+
+# Bump whenever parsing or rendering changes what a cached record would
+# contain, so records written by an older parser are never reused.
+PARSER_VERSION = "8"
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def cache_key(markdown, context=""):
+    digest = hashlib.sha256()
+    digest.update(f"{PARSER_VERSION}\0{context}\0".encode("utf-8"))
+    digest.update(markdown.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """
+    On-disk cache of parsed documents, keyed by a hash of the parser
+    version and the Markdown source. Each record is a small dict (e.g.
+    the rendered body HTML and title) stored as zlib-compressed JSON, one
+    file per key. Reading a record bumps its mtime; `trim()` evicts the
+    least recently used records once the cache grows past `max_bytes`.
+    The directory can be saved and restored between CI runs.
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, markdown, context=""):
+        return cache_key(markdown, context)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + ".json.z")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                record = json.loads(zlib.decompress(f.read()))
+            os.utime(path)
+        except (OSError, ValueError, zlib.error):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return record
+
+    def put(self, key, record):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = zlib.compress(json.dumps(record, separators=(",", ":")).encode("utf-8"))
+        # Unique temp name: several worker processes may write concurrently
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def trim(self):
+        """
+        Deletes least recently used records until the cache fits in
+        max_bytes. Returns the number of records removed.
+        """
+        entries = []
+        total = 0
+        for root, dirs, files in os.walk(self.directory):
+            for file_name in files:
+                path = os.path.join(root, file_name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, path))
+                total += stat.st_size
+
+        removed = 0
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                os.rmdir(os.path.dirname(path))
+            except OSError:
+                pass  # already gone, or the directory still has records
+            total -= size
+            removed += 1
+        return removed
+
+
+class MemoryParseCache:
+    """
+    Same interface as ParseCache, holding records in memory instead, for
+    a long-running process (the build daemon). Least recently used
+    records are evicted as soon as the records' rendered HTML exceeds
+    `max_bytes`. Worker processes don't share it.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.records = OrderedDict()  # key -> (record, size)
+        self.size = 0
+
+    def key(self, markdown, context=""):
+        return cache_key(markdown, context)
+
+    def get(self, key):
+        entry = self.records.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.records.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, record):
+        size = len(record.get("html", ""))
+        old = self.records.pop(key, None)
+        if old is not None:
+            self.size -= old[1]
+        self.records[key] = (record, size)
+        self.size += size
+        while self.size > self.max_bytes and len(self.records) > 1:
+            _, (_, evicted_size) = self.records.popitem(last=False)
+            self.size -= evicted_size
+
+    def trim(self):
+        # put() already keeps the cache within max_bytes
+        return 0
@@ -0,0 +1,53 @@
+import threading
+from collections import deque
+
+
+def prefetched(items, read, executor, depth):
+    """
+    Yields (item, future) for every item in order, where the future
+    holds the result of `read(item)` run on `executor`. Up to `depth`
+    reads run ahead of the consumer; no more are started until it takes
+    the next item, so memory stays bounded.
+    """
+    pending = deque()
+    for item in items:
+        pending.append((item, executor.submit(read, item)))
+        if len(pending) > depth:
+            yield pending.popleft()
+    while pending:
+        yield pending.popleft()
+
+
+class BoundedWriter:
+    """
+    Runs write calls on `executor` while the producer carries on, but
+    blocks `submit` while `depth` writes are still in flight.
+    """
+
+    def __init__(self, executor, depth):
+        self.executor = executor
+        self.slots = threading.BoundedSemaphore(depth)
+        self.futures = []
+
+    def submit(self, key, write, *args):
+        self.slots.acquire()
+        try:
+            future = self.executor.submit(write, *args)
+        except BaseException:
+            self.slots.release()
+            raise
+        future.add_done_callback(lambda _: self.slots.release())
+        self.futures.append((key, future))
+
+    def wait(self):
+        """
+        Waits for every submitted write. Returns (key, exception) for
+        each one that failed.
+        """
+        errors = []
+        for key, future in self.futures:
+            error = future.exception()
+            if error is not None:
+                errors.append((key, error))
+        self.futures = []
+        return errors
@@ -0,0 +1,118 @@
+import os
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+# Text formats worth compressing; images and fonts are already compressed
+COMPRESSIBLE_EXTENSIONS = (
+    ".html", ".htm", ".css", ".js", ".mjs", ".json", ".xml", ".svg", ".txt", ".md", ".csv", ".map",
+)
+
+DEFAULT_LEVEL = 9
+DEFAULT_MIN_SIZE = 1024
+
+
+def gzip_bytes(data, level=DEFAULT_LEVEL):
+    # wbits=31 writes a gzip header with mtime 0, so output is reproducible
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+def is_compressible(path):
+    return path.lower().endswith(COMPRESSIBLE_EXTENSIONS)
+
+
+def precompress_file(path, level=DEFAULT_LEVEL):
+    """
+    Writes path + ".gz" and gives it the source's mtime, which is how
+    later builds recognise it as up to date.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    gz_path = path + ".gz"
+    tmp_path = gz_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(gzip_bytes(data, level))
+    stat = os.stat(path)
+    os.utime(tmp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    os.replace(tmp_path, gz_path)
+    return gz_path
+
+
+def precompress_tree(directory, level=DEFAULT_LEVEL, min_size=DEFAULT_MIN_SIZE, jobs=1, previous=(), published=()):
+    """
+    Writes a .gz sibling for every text file of at least `min_size` bytes
+    under `directory` (generated pages and copied static files alike),
+    for servers that serve precompressed files. A .gz whose mtime matches
+    its source is already up to date and skipped. Hidden files (the build
+    manifest) are left alone.
+
+    `previous` lists the .gz files (relative to `directory`) the last run
+    wrote; those whose source was removed or became too small are
+    deleted. Any other .gz is not ours to touch, and neither is one in
+    `published`, the outputs of other build steps (e.g. a feed.json.gz
+    shipped as a static file), which is never overwritten.
+
+    Returns (written, stats): the .gz files to pass as `previous` next
+    time, and counts of compressed / unchanged / removed files.
+    """
+    previous = set(previous)
+    published = set(published)
+    written = []
+    stats = {"compressed": 0, "unchanged": 0, "removed": 0}
+    to_compress = []
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        names = set(files)
+        rel_root = os.path.relpath(root, directory)
+        for file_name in sorted(files):
+            if file_name.startswith("."):
+                continue
+            path = os.path.join(root, file_name)
+            rel_path = os.path.normpath(os.path.join(rel_root, file_name))
+
+            if file_name.endswith(".gz"):
+                source_name = file_name[:-3]
+                if rel_path in previous and rel_path not in published and (
+                    source_name not in names or os.path.getsize(os.path.join(root, source_name)) < min_size
+                ):
+                    os.remove(path)
+                    stats["removed"] += 1
+                continue
+
+            if not is_compressible(file_name) or rel_path + ".gz" in published:
+                continue
+            stat = os.stat(path)
+            if stat.st_size < min_size:
+                continue
+            written.append(rel_path + ".gz")
+            if file_name + ".gz" in names and os.stat(path + ".gz").st_mtime_ns == stat.st_mtime_ns:
+                stats["unchanged"] += 1
+                continue
+            to_compress.append(path)
+
+    # zlib releases the GIL while deflating, so threads use every core
+    # without the cost of shipping file contents to worker processes
+    if jobs > 1 and len(to_compress) > 1:
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            list(executor.map(lambda path: precompress_file(path, level), to_compress))
+    else:
+        for path in to_compress:
+            precompress_file(path, level)
+    stats["compressed"] = len(to_compress)
+    return written, stats
+
+
+def remove_compressed(directory, previous, published=()):
+    """
+    Deletes the .gz files (relative to `directory`) a precompress_tree
+    run wrote, once precompression is turned off, except those in
+    `published`. Returns how many were removed.
+    """
+    published = set(published)
+    removed = 0
+    for rel_path in previous:
+        path = os.path.join(directory, rel_path)
+        if rel_path not in published and os.path.isfile(path):
+            os.remove(path)
+            removed += 1
+    return removed
@@ -0,0 +1,123 @@
+import contextlib
+import json
+import sys
+import time
+
+# The profiler the build is currently reporting to, or None. Pipeline code
+# calls `stage(name)` unconditionally; it is a no-op unless a profiler has
+# been activated with `activate()`.
+_active = None
+_NULL_STAGE = contextlib.nullcontext()
+
+
+def activate(profiler):
+    global _active
+    _active = profiler
+
+
+def active():
+    return _active
+
+
+def stage(name):
+    if _active is None:
+        return _NULL_STAGE
+    return _active.stage(name)
+
+
+class BuildProfiler:
+    """
+    Records wall time and net allocated memory blocks per named stage.
+    Stages nest; each stage's numbers are exclusive of its children, so
+    e.g. "tree_build" does not double-count the "inline" stages inside it.
+    Stages entered while a page is open (see `page()`) are recorded for
+    that page, others for the build as a whole.
+    """
+
+    def __init__(self):
+        self.pages = {}        # page path -> {stage: {"time", "blocks", "calls"}}
+        self.build_stages = {}
+        self._current = self.build_stages
+        self._stack = []
+
+    @contextlib.contextmanager
+    def page(self, path):
+        previous = self._current
+        self._current = self.pages.setdefault(path, {})
+        try:
+            yield
+        finally:
+            self._current = previous
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        frame = [0.0, 0]   # time and blocks spent in child stages
+        self._stack.append(frame)
+        start_blocks = sys.getallocatedblocks()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            blocks = sys.getallocatedblocks() - start_blocks
+            self._stack.pop()
+            if self._stack:
+                self._stack[-1][0] += elapsed
+                self._stack[-1][1] += blocks
+            record = self._current.setdefault(name, {"time": 0.0, "blocks": 0, "calls": 0})
+            record["time"] += elapsed - frame[0]
+            record["blocks"] += blocks - frame[1]
+            record["calls"] += 1
+
+    def add_page(self, path, stages):
+        # Merges a page record produced in another process
+        self.pages[path] = stages
+
+    def stage_totals(self):
+        totals = {}
+        for stages in [self.build_stages, *self.pages.values()]:
+            for name, record in stages.items():
+                total = totals.setdefault(name, {"time": 0.0, "blocks": 0, "calls": 0})
+                for key in total:
+                    total[key] += record[key]
+        return totals
+
+    def slowest_pages(self, limit=10):
+        ranked = sorted(
+            self.pages.items(),
+            key=lambda item: sum(record["time"] for record in item[1].values()),
+            reverse=True,
+        )
+        return ranked[:limit]
+
+    def report(self, limit=10):
+        pages = []
+        for path, stages in self.slowest_pages(limit):
+            total = sum(record["time"] for record in stages.values())
+            slowest = max(stages, key=lambda name: stages[name]["time"]) if stages else None
+            pages.append({"page": path, "time": total, "slowest_stage": slowest, "stages": stages})
+        return {
+            "pages_profiled": len(self.pages),
+            "stages": self.stage_totals(),
+            "build_stages": self.build_stages,
+            "slowest_pages": pages,
+        }
+
+    def write_report(self, path, limit=10):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(limit), f, indent=2)
+
+    def print_summary(self, limit=10):
+        totals = self.stage_totals()
+        grand_total = sum(record["time"] for record in totals.values()) or 1.0
+        print(f"\n{'stage':<14}{'time (ms)':>12}{'share':>8}{'calls':>9}{'net blocks':>12}")
+        for name, record in sorted(totals.items(), key=lambda item: item[1]["time"], reverse=True):
+            print(
+                f"{name:<14}{record['time'] * 1000:>12.2f}{record['time'] / grand_total:>8.1%}"
+                f"{record['calls']:>9}{record['blocks']:>12}"
+            )
+        print(f"\nslowest pages:")
+        for path, stages in self.slowest_pages(limit):
+            total = sum(record["time"] for record in stages.values())
+            slowest = max(stages, key=lambda name: stages[name]["time"]) if stages else "-"
+            print(f"{total * 1000:>10.2f} ms  {path}  (mostly {slowest})")
@@ -0,0 +1,129 @@
+import json
+import os
+import re
+from collections import Counter
+
+SEARCH_DIR_NAME = "search"
+PREFIX_LENGTH = 2
+
+TERM_PATTERN = re.compile(r"[^\W_]+")
+HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+
+# How much more a term counts in the title or a heading than in body text
+TITLE_WEIGHT = 10
+HEADING_WEIGHT = 3
+
+STOP_WORDS = frozenset(
+    "a an and are as at be but by for from has have he her his i in is it its of on or "
+    "our she so that the their them they this to was we were which who will with you your".split()
+)
+
+
+def tokenize(text):
+    return [
+        term for term in TERM_PATTERN.findall(text.lower())
+        if len(term) > 1 and term not in STOP_WORDS
+    ]
+
+
+def node_text(node, parts):
+    # Appends the text of `node` and its descendants (and image alt text)
+    # to `parts`
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if node.value:
+            parts.append(node.value)
+        elif node.tag == "img" and node.props.get("alt"):
+            parts.append(node.props["alt"])
+        stack.extend(reversed(node.children))
+    return parts
+
+
+class SearchDocument:
+    """
+    Collects the searchable text of one page from its block nodes, as
+    they are produced by the parser: headings separately, so their terms
+    can be weighted higher, and everything else as body text.
+    """
+
+    def __init__(self):
+        self.headings = []
+        self.terms = Counter()
+
+    def add_node(self, node):
+        text = " ".join(node_text(node, []))
+        if node.tag in HEADING_TAGS:
+            self.headings.append(text)
+            weight = HEADING_WEIGHT
+        else:
+            weight = 1
+        for term in tokenize(text):
+            self.terms[term] += weight
+
+    def to_dict(self, title):
+        terms = Counter(self.terms)
+        for term in tokenize(title):
+            terms[term] += TITLE_WEIGHT
+        return {"title": title, "headings": self.headings, "terms": dict(terms)}
+
+
+def shard_name(term):
+    return term[:PREFIX_LENGTH]
+
+
+def write_search_index(documents, dest_dir_path):
+    """
+    Writes the client-side search index for `documents`, a dict mapping
+    each page URL to its search document, under dest_dir_path/search:
+
+      documents.json    [[url, title], ...], indexed by document id
+      terms/<xx>.json   {term: [[document id, weight], ...]} for every
+                        term starting with <xx>, best matches first
+      meta.json         the prefix length and list of shards
+
+    so a browser only fetches the shards for the terms it looks up.
+    Files whose content is unchanged are not rewritten, and shards no
+    longer needed are removed. Returns counts of written / unchanged /
+    removed files.
+    """
+    search_dir = os.path.join(dest_dir_path, SEARCH_DIR_NAME)
+    terms_dir = os.path.join(search_dir, "terms")
+    os.makedirs(terms_dir, exist_ok=True)
+
+    urls = sorted(documents)
+    shards = {}
+    for doc_id, url in enumerate(urls):
+        for term, weight in documents[url]["terms"].items():
+            shards.setdefault(shard_name(term), {}).setdefault(term, []).append([doc_id, weight])
+    for shard in shards.values():
+        for postings in shard.values():
+            postings.sort(key=lambda posting: (-posting[1], posting[0]))
+
+    files = {
+        os.path.join(search_dir, "documents.json"): [[url, documents[url]["title"]] for url in urls],
+        os.path.join(search_dir, "meta.json"): {"prefix_length": PREFIX_LENGTH, "shards": sorted(shards)},
+    }
+    for name, shard in shards.items():
+        files[os.path.join(terms_dir, name + ".json")] = shard
+
+    stats = {"written": 0, "unchanged": 0, "removed": 0}
+    for path, data in files.items():
+        text = json.dumps(data, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                if f.read() == text:
+                    stats["unchanged"] += 1
+                    continue
+        except OSError:
+            pass
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        stats["written"] += 1
+
+    for file_name in os.listdir(terms_dir):
+        path = os.path.join(terms_dir, file_name)
+        if path not in files:
+            os.remove(path)
+            stats["removed"] += 1
+    return stats
@@ -0,0 +1,201 @@
+import json
+import os
+import posixpath
+import re
+import shutil
+from manifest import hash_file
+
+ASSET_MANIFEST_NAME = "asset-manifest.json"
+FINGERPRINT_LENGTH = 10
+
+# Only assets pages link to are fingerprinted. Files that are fetched by
+# a fixed name (CNAME, robots.txt, favicon.ico, web manifests, ...) or
+# from places links aren't rewritten in keep their names.
+FINGERPRINT_EXTENSIONS = (
+    ".css", ".js", ".mjs", ".png", ".jpg", ".jpeg", ".gif", ".webp", ".avif", ".svg",
+    ".woff", ".woff2", ".ttf", ".otf", ".eot", ".mp4", ".webm", ".mp3", ".ogg", ".pdf",
+)
+FIXED_NAMES = {"favicon.ico", "favicon.png", "favicon.svg", "apple-touch-icon.png"}
+FIXED_DIRS = {".well-known"}
+
+# URLs in stylesheets: url(...) and @import "..."
+CSS_URL_PATTERN = re.compile(r"""url\(\s*(['"]?)([^'")]+?)\1\s*\)|@import\s+(['"])([^'"]+)\3""")
+
+
+def fingerprinted_path(rel_path, file_hash):
+    # "images/a.png" -> "images/a.3f9a1c0b2d.png"
+    root, ext = os.path.splitext(rel_path)
+    return f"{root}.{file_hash[:FINGERPRINT_LENGTH]}{ext}"
+
+
+def can_fingerprint(rel_path):
+    parts = rel_path.split(os.sep)
+    name = parts[-1].lower()
+    if any(part.startswith(".") or part in FIXED_DIRS for part in parts):
+        return False
+    if name in FIXED_NAMES or name.startswith("apple-touch-icon"):
+        return False
+    return name.endswith(FINGERPRINT_EXTENSIONS)
+
+
+def css_references(css_path, rel_path):
+    """
+    The static files (relative paths) a stylesheet refers to with
+    url(...) or @import. Links in CSS are not rewritten, so these keep
+    their names.
+    """
+    with open(css_path, "r", encoding="utf-8", errors="replace") as f:
+        text = f.read()
+    base = posixpath.dirname(rel_path.replace(os.sep, "/"))
+    references = set()
+    for match in CSS_URL_PATTERN.finditer(text):
+        url = (match.group(2) or match.group(4)).strip()
+        if not url or url.startswith(("#", "//", "data:")) or re.match(r"^[A-Za-z][A-Za-z0-9+.-]*:", url):
+            continue
+        path = url.split("#", 1)[0].split("?", 1)[0]
+        path = path[1:] if path.startswith("/") else posixpath.join(base, path)
+        path = posixpath.normpath(path)
+        if not path.startswith("../"):
+            references.add(path.replace("/", os.sep))
+    return references
+
+
+def sync_static_files(source_dir_path, dest_dir_path, previous=None, use_hash=False, fingerprint=False):
+    """
+    Mirrors source_dir_path into dest_dir_path, copying only new or
+    changed files. `previous` is the state returned by the last sync (as
+    stored in the build manifest); files listed there that no longer
+    exist in the source are removed from the destination. Other files in
+    the destination (generated pages) are left alone.
+
+    A file is unchanged when the destination has the same size and mtime
+    (copy2 preserves mtime). With `use_hash`, files whose size matches
+    but mtime differs (e.g. after a fresh checkout) are compared by
+    content hash and only have their mtime refreshed if identical.
+
+    With `fingerprint`, assets (see can_fingerprint) are published under
+    a name containing their content hash (see fingerprinted_path), so
+    they can be cached forever; the previous version of a changed file
+    is removed. Files stylesheets refer to keep their names, since URLs
+    inside CSS are not rewritten.
+
+    Returns (state, stats): the new state to store, and counts of
+    copied / unchanged / removed files.
+    """
+    previous = previous or {}
+    state = {}
+    stats = {"copied": 0, "unchanged": 0, "removed": 0}
+
+    sources = []
+    for root, dirs, files in os.walk(source_dir_path):
+        dirs.sort()
+        rel_root = os.path.relpath(root, source_dir_path)
+        for file_name in sorted(files):
+            from_path = os.path.join(root, file_name)
+            rel_path = os.path.normpath(os.path.join(rel_root, file_name))
+            sources.append((from_path, rel_path, os.stat(from_path)))
+
+    # What stylesheets refer to, remembered per stylesheet like hashes
+    css_refs = {}
+    if fingerprint:
+        for from_path, rel_path, src_stat in sources:
+            if rel_path.lower().endswith(".css"):
+                old = previous.get(rel_path, {})
+                if old.get("mtime") == src_stat.st_mtime_ns and old.get("size") == src_stat.st_size and "refs" in old:
+                    css_refs[rel_path] = old["refs"]
+                else:
+                    css_refs[rel_path] = sorted(css_references(from_path, rel_path))
+    css_referenced = {path for refs in css_refs.values() for path in refs}
+
+    for from_path, rel_path, src_stat in sources:
+        entry = {"size": src_stat.st_size, "mtime": src_stat.st_mtime_ns}
+        old = previous.get(rel_path, {})
+        if rel_path in css_refs:
+            entry["refs"] = css_refs[rel_path]
+
+        output_path = rel_path
+        if fingerprint and can_fingerprint(rel_path) and rel_path not in css_referenced:
+            if old.get("mtime") == entry["mtime"] and old.get("size") == entry["size"] and "hash" in old:
+                entry["hash"] = old["hash"]
+            else:
+                entry["hash"] = hash_file(from_path)
+            output_path = fingerprinted_path(rel_path, entry["hash"])
+            entry["output"] = output_path
+        dest_path = os.path.join(dest_dir_path, output_path)
+
+        if _is_unchanged(from_path, src_stat, dest_path, old, entry, use_hash):
+            stats["unchanged"] += 1
+        else:
+            os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+            shutil.copy2(from_path, dest_path)
+            print(f" * {from_path} -> {dest_path}")
+            stats["copied"] += 1
+        old_output_path = old.get("output", rel_path)
+        if old and old_output_path != output_path:
+            _remove_output(os.path.join(dest_dir_path, old_output_path))
+        if use_hash and "hash" not in entry:
+            if old.get("mtime") == entry["mtime"] and "hash" in old:
+                entry["hash"] = old["hash"]
+            else:
+                entry["hash"] = hash_file(from_path)
+        state[rel_path] = entry
+
+    for rel_path in sorted(set(previous) - set(state)):
+        dest_path = os.path.join(dest_dir_path, previous[rel_path].get("output", rel_path))
+        if _remove_output(dest_path):
+            stats["removed"] += 1
+
+    return state, stats
+
+
+def _remove_output(dest_path):
+    if not os.path.isfile(dest_path):
+        return False
+    os.remove(dest_path)
+    print(f" * Removed stale static file: {dest_path}")
+    return True
+
+
+def asset_map(state):
+    """
+    Maps the root-relative URL of every static file to the URL it is
+    published under, e.g. {"/index.css": "/index.3f9a1c0b2d.css"}, for
+    files that were fingerprinted.
+    """
+    assets = {}
+    for rel_path, entry in state.items():
+        if "output" in entry:
+            url = "/" + rel_path.replace(os.sep, "/")
+            assets[url] = "/" + entry["output"].replace(os.sep, "/")
+    return assets
+
+
+def write_asset_manifest(assets, dest_dir_path):
+    path = os.path.join(dest_dir_path, ASSET_MANIFEST_NAME)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(assets, f, indent=1, sort_keys=True)
+    return path
+
+
+def _is_unchanged(from_path, src_stat, dest_path, old, entry, use_hash):
+    try:
+        dest_stat = os.stat(dest_path)
+    except FileNotFoundError:
+        return False
+    if dest_stat.st_size != src_stat.st_size:
+        return False
+    if dest_stat.st_mtime_ns == src_stat.st_mtime_ns:
+        return True
+    if not use_hash:
+        return False
+
+    source_hash = hash_file(from_path)
+    entry["hash"] = source_hash
+    # The stored hash describes what was last copied to dest_path
+    dest_hash = old.get("hash") if old.get("mtime") == dest_stat.st_mtime_ns else None
+    if dest_hash is None:
+        dest_hash = hash_file(dest_path)
+    if dest_hash != source_hash:
+        return False
+    os.utime(dest_path, ns=(src_stat.st_atime_ns, src_stat.st_mtime_ns))
+    return True
@@ -0,0 +1,152 @@
+import os
+import re
+import urls
+
+# {{ include "partials/nav.html" }}, or a placeholder
+TAG_PATTERN = re.compile(r'\{\{\s*(?:include\s+"([^"]+)"|(\w+))\s*\}\}')
+
+# A template in a content directory applies to the pages under it
+DIRECTORY_TEMPLATE_NAME = "_template.html"
+
+
+class Template:
+    """
+    A template compiled into alternating literal segments and placeholder
+    names. `segments[0::2]` are literals, `segments[1::2]` are names, so
+    rendering is a single join no matter how many placeholders there are.
+    """
+
+    def __init__(self, segments, references=(), files=()):
+        self.segments = segments
+        self.references = list(references)  # URLs in the template's own links
+        self.files = list(files)  # the template's file and its partials'
+
+    @property
+    def placeholders(self):
+        return self.segments[1::2]
+
+    def render(self, values):
+        parts = self.segments[:]
+        for i in range(1, len(parts), 2):
+            parts[i] = values.get(parts[i], "")
+        return "".join(parts)
+
+    def render_to(self, write, values):
+        """
+        Streams the page to `write`. A value may be a string or a callable
+        taking `write`, so large content (e.g. an HTMLNode's render_to)
+        goes straight to the output without being joined first.
+        """
+        segments = self.segments
+        for i, segment in enumerate(segments):
+            if i % 2 == 0:
+                write(segment)
+                continue
+            value = values.get(segment, "")
+            if callable(value):
+                value(write)
+            else:
+                write(value)
+
+    def __repr__(self):
+        return f"Template({self.segments!r})"
+
+
+def compile_template(text, resolver=None, minifier=None, include=None):
+    # The template's own links are resolved, and its markup minified if
+    # a minifier is given, once here instead of in every rendered page.
+    # The resolver defaults to the build's active one. `include(path)`
+    # returns the compiled partial for an include tag; its segments are
+    # spliced in, so pages render it without any extra work.
+    resolver = resolver or urls.active()
+    with resolver.recording_references() as references:
+        text = resolver.resolve_html_attributes(text)
+    if minifier is not None:
+        text = minifier.minify(text)
+    segments = [""]
+    files = []
+    last_index = 0
+    for match in TAG_PATTERN.finditer(text):
+        segments[-1] += text[last_index:match.start()]
+        last_index = match.end()
+        include_path, name = match.groups()
+        if name is not None:
+            segments += [name, ""]
+            continue
+        if include is None:
+            raise ValueError(f"Cannot include {include_path!r} here")
+        partial = include(include_path)
+        segments[-1] += partial.segments[0]
+        segments += partial.segments[1:]
+        references += partial.references
+        files += [path for path in partial.files if path not in files]
+    segments[-1] += text[last_index:]
+    return Template(segments, references, files)
+
+
+_template_cache = {}
+
+
+_loading = []  # templates being compiled, to catch include cycles
+
+
+def _signature(paths):
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        signature.append((stat.st_mtime_ns, stat.st_size))
+    return signature
+
+
+def load_template(template_path, resolver=None, minifier=None):
+    """
+    Returns the compiled template for `template_path`, reading and
+    compiling it only when it is first requested or it or one of its
+    partials has changed on disk. Partials are cached the same way, so
+    each is read, resolved and minified once however many templates and
+    pages use it. Include paths are relative to the site directory (the
+    working directory), like template.html itself.
+    """
+    resolver = resolver or urls.active()
+    key = (os.path.abspath(template_path), resolver.key(), minifier.key() if minifier else None)
+    cached = _template_cache.get(key)
+    if cached is not None and cached[0] == _signature(cached[1].files):
+        return cached[1]
+
+    if key[0] in _loading:
+        raise ValueError(f"Include cycle: {' -> '.join(_loading + [key[0]])}")
+    _loading.append(key[0])
+    try:
+        signature = _signature([template_path])  # before reading, so a concurrent edit is seen next time
+        with open(template_path, "r", encoding="utf-8") as template_file:
+            template = compile_template(
+                template_file.read(),
+                resolver,
+                minifier,
+                include=lambda path: load_template(path, resolver, minifier),
+            )
+    finally:
+        _loading.pop()
+    template.files.insert(0, template_path)
+    _template_cache[key] = (signature + _signature(template.files[1:]), template)
+    return template
+
+
+def find_template(dir_path, content_root, default_path):
+    """
+    Returns the template for pages in `dir_path`: the nearest
+    DIRECTORY_TEMPLATE_NAME in it or one of its parents up to
+    `content_root`, or `default_path` if there is none.
+    """
+    dir_path = os.path.normpath(dir_path)
+    content_root = os.path.normpath(content_root)
+    while True:
+        path = os.path.join(dir_path, DIRECTORY_TEMPLATE_NAME)
+        if os.path.isfile(path):
+            return path
+        if dir_path == content_root or not dir_path.startswith(content_root):
+            return default_path
+        dir_path = os.path.dirname(dir_path)
@@ -0,0 +1,92 @@
+import unittest
+from block_scanner import Block, BlockType, scan_blocks, classify_lines
+from Block_type import markdown_to_html_node, block_to_block_type
+
+
+class TestScanBlocks(unittest.TestCase):
+    def scan(self, markdown):
+        return list(scan_blocks(markdown.split("\n")))
+
+    def test_types_and_line_numbers(self):
+        md = "# Title\n\npara one\nline two\n\n> quote\n> more\n\n1. a\n2. b\n\n- x\n- y"
+        self.assertEqual(
+            self.scan(md),
+            [
+                Block(BlockType.HEADING, ["# Title"], 1),
+                Block(BlockType.PARAGRAPH, ["para one", "line two"], 3),
+                Block(BlockType.QUOTE, ["> quote", "> more"], 6),
+                Block(BlockType.ORDERED_LIST, ["1. a", "2. b"], 9),
+                Block(BlockType.UNORDERED_LIST, ["- x", "- y"], 12),
+            ],
+        )
+
+    def test_fenced_code_keeps_blank_lines(self):
+        md = "intro\n\n```\nfirst\n\n\n    indented\n```\n\nafter"
+        blocks = self.scan(md)
+        self.assertEqual(len(blocks), 3)
+        self.assertEqual(blocks[1], Block(BlockType.CODE, ["```", "first", "", "", "    indented", "```"], 3))
+        self.assertEqual(blocks[2].start_line, 10)
+
+    def test_unclosed_fence_runs_to_end(self):
+        blocks = self.scan("intro\n\n```\nstill code\n\n- item\n\n")
+        self.assertEqual(
+            blocks,
+            [
+                Block(BlockType.PARAGRAPH, ["intro"], 1),
+                Block(BlockType.CODE, ["```", "still code", "", "- item"], 3),
+            ],
+        )
+        html = markdown_to_html_node("```\nstill code\n\n- item\n").to_html()
+        self.assertEqual(html, "<div><pre><code>still code\n\n- item\n</code></pre></div>")
+
+    def test_long_fence_with_blank_lines(self):
+        body = ["" if i % 3 == 0 else f"line {i}" for i in range(20000)]
+        markdown = "\n".join(["```"] + body + ["```", "", "after"])
+        blocks = self.scan(markdown)
+        self.assertEqual(len(blocks), 2)
+        self.assertEqual(blocks[0], Block(BlockType.CODE, ["```"] + body + ["```"], 1))
+        self.assertEqual(blocks[1], Block(BlockType.PARAGRAPH, ["after"], 20004))
+        html = markdown_to_html_node(markdown).to_html()
+        self.assertTrue(html.startswith("<div><pre><code>\nline 1\nline 2\n\nline 4"))
+        self.assertTrue(html.endswith("line 19999\n</code></pre><p>after</p></div>"))
+
+    def test_inline_code_line_is_not_a_fence(self):
+        blocks = self.scan("```code```\n\nnext")
+        self.assertEqual([b.block_type for b in blocks], [BlockType.PARAGRAPH, BlockType.PARAGRAPH])
+
+    def test_reads_file_like_lines(self):
+        lines = ["# Title\n", "\r\n", "text\r\n"]
+        self.assertEqual(
+            list(scan_blocks(lines)),
+            [Block(BlockType.HEADING, ["# Title"], 1), Block(BlockType.PARAGRAPH, ["text"], 3)],
+        )
+
+    def test_block_to_block_type(self):
+        self.assertEqual(block_to_block_type("```\ncode\n```"), BlockType.CODE)
+        self.assertEqual(block_to_block_type("1. a\n3. b"), BlockType.PARAGRAPH)
+        self.assertEqual(classify_lines(["###### h6"]), BlockType.HEADING)
+
+
+class TestMarkdownToHtmlNode(unittest.TestCase):
+    def test_code_block_with_blank_lines(self):
+        md = "```\nline one\n\nline three\n```"
+        self.assertEqual(
+            markdown_to_html_node(md).to_html(),
+            "<div><pre><code>line one\n\nline three\n</code></pre></div>",
+        )
+
+    def test_long_ordered_list(self):
+        md = "\n".join(f"{i}. item {i}" for i in range(1, 12))
+        html = markdown_to_html_node(md).to_html()
+        self.assertIn("<li>item 10</li><li>item 11</li>", html)
+
+    def test_paragraph_and_heading(self):
+        md = "## Hello **world**\n\nsome\ntext"
+        self.assertEqual(
+            markdown_to_html_node(md).to_html(),
+            "<div><h2>Hello <b>world</b></h2><p>some text</p></div>",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,27 @@
+import pickle
+import unittest
+from build_settings import BuildSettings
+from inline_cache import InlineCache
+from minify import HtmlMinifier
+from parse_cache import ParseCache, MemoryParseCache
+
+
+class TestBuildSettings(unittest.TestCase):
+    def test_worker_copy(self):
+        memo = InlineCache(5)
+        memo.entries[("x", "/")] = ((), ())
+        settings = BuildSettings(search=True, minifier=HtmlMinifier(True), parse_cache=ParseCache("cache", 10),
+                                 inline_cache=memo)
+        copy = pickle.loads(pickle.dumps(settings))
+        self.assertTrue(copy.search)
+        self.assertEqual(copy.minifier.key(), settings.minifier.key())
+        self.assertEqual((copy.parse_cache.directory, copy.parse_cache.max_bytes), ("cache", 10))
+        self.assertEqual((copy.inline_cache.max_entries, len(copy.inline_cache.entries)), (5, 0))
+        self.assertEqual(len(memo.entries), 1)
+
+        settings.parse_cache = MemoryParseCache()
+        self.assertIsNone(pickle.loads(pickle.dumps(settings)).parse_cache)
+
+
+if __name__ == "__main__":
+    unittest.main()
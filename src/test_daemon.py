@@ -0,0 +1,91 @@
+import contextlib
+import io
+import os
+import tempfile
+import threading
+import unittest
+import build_client
+import main
+from daemon import serve
+from parse_cache import MemoryParseCache
+
+
+class TestBuildDaemon(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self.tmp.name, "build.sock")
+        self.requests = []
+        ready = threading.Event()
+
+        def build(paths):
+            self.requests.append(paths)
+            print(f"building {len(paths)} path(s)")
+            if paths == ["/fail"]:
+                raise RuntimeError("1 broken link(s)")
+
+        def run():
+            with contextlib.redirect_stdout(io.StringIO()):
+                ready.set()
+                serve(build, self.socket_path)
+
+        self.thread = threading.Thread(target=run, daemon=True)
+        self.thread.start()
+        ready.wait()
+        for _ in range(200):
+            if os.path.exists(self.socket_path):
+                break
+            self.thread.join(0.01)
+
+    def tearDown(self):
+        if self.thread.is_alive():
+            build_client.request(["stop"], self.socket_path, io.StringIO())
+        self.thread.join(5)
+        self.tmp.cleanup()
+
+    def request(self, words):
+        out = io.StringIO()
+        status = build_client.request(words, self.socket_path, out)
+        return status, out.getvalue()
+
+    def test_build_requests(self):
+        self.assertEqual(self.request(["ping"]), (0, ""))
+        status, log = self.request(["build", "/site/content/a b.md"])
+        self.assertEqual(status, 0)
+        self.assertIn("building 1 path(s)", log)
+        status, log = self.request(["build", "/fail"])
+        self.assertEqual(status, 1)
+        self.assertIn("Build failed: 1 broken link(s)", log)
+        self.assertEqual(self.requests, [["/site/content/a b.md"], ["/fail"]])
+        self.assertEqual(self.request(["frobnicate"])[0], 2)
+
+    def test_stop(self):
+        self.assertEqual(self.request(["stop"]), (0, "Stopping\n"))
+        self.thread.join(5)
+        self.assertFalse(self.thread.is_alive())
+        self.assertFalse(os.path.exists(self.socket_path))
+
+
+class TestDaemonPages(unittest.TestCase):
+    def test_daemon_pages(self):
+        content = os.path.abspath(main.dir_path_content)
+        page = os.path.join(content, "blog", "index.md")
+        self.assertEqual(main.daemon_pages([page]), {page})
+        self.assertIsNone(main.daemon_pages([]))
+        self.assertIsNone(main.daemon_pages([page, os.path.abspath(main.template_path)]))
+
+
+class TestMemoryParseCache(unittest.TestCase):
+    def test_lru_eviction(self):
+        cache = MemoryParseCache(max_bytes=10)
+        cache.put("a", {"html": "aaaaa"})
+        cache.put("b", {"html": "bbbbb"})
+        self.assertEqual(cache.get("a"), {"html": "aaaaa"})
+        cache.put("c", {"html": "ccccc"})
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), {"html": "ccccc"})
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+        self.assertEqual(cache.key("# x", "/"), cache.key("# x", "/"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import os
+import tempfile
+import threading
+import unittest
+from devserver import snapshot, changed_paths, ReloadNotifier, Watcher
+
+
+class TestSnapshot(unittest.TestCase):
+    def test_changed_paths(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            kept = os.path.join(tmp, "kept.md")
+            edited = os.path.join(tmp, "sub", "edited.md")
+            removed = os.path.join(tmp, "removed.md")
+            os.makedirs(os.path.dirname(edited))
+            for path in (kept, edited, removed):
+                with open(path, "w") as f:
+                    f.write("x")
+            before = snapshot([tmp])
+            self.assertEqual(set(before), {kept, edited, removed})
+
+            with open(edited, "w") as f:
+                f.write("longer")
+            os.remove(removed)
+            added = os.path.join(tmp, "added.md")
+            with open(added, "w") as f:
+                f.write("x")
+            self.assertEqual(changed_paths(before, snapshot([tmp])), {edited, removed, added})
+
+
+class TestWatcher(unittest.TestCase):
+    def test_burst_triggers_single_callback(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            calls = []
+            stop_event = threading.Event()
+
+            def on_change(paths):
+                calls.append(paths)
+                stop_event.set()
+
+            watcher = Watcher([tmp], on_change, interval=0.02, debounce=0.05)
+            thread = threading.Thread(target=watcher.run, args=(stop_event,))
+            thread.start()
+            try:
+                threading.Event().wait(0.05)
+                for name in ("a.md", "b.md", "c.md"):
+                    with open(os.path.join(tmp, name), "w") as f:
+                        f.write("x")
+                stop_event.wait(5)
+            finally:
+                stop_event.set()
+                thread.join()
+            self.assertEqual(len(calls), 1)
+            self.assertEqual([os.path.basename(p) for p in calls[0]], ["a.md", "b.md", "c.md"])
+
+
+class TestReloadNotifier(unittest.TestCase):
+    def test_wait_returns_new_generation(self):
+        notifier = ReloadNotifier()
+        self.assertEqual(notifier.wait(0, timeout=0.01), 0)
+        notifier.notify()
+        self.assertEqual(notifier.wait(0, timeout=0.01), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+from front_matter import (
+    parse_front_matter, split_front_matter, strip_front_matter, scan_metadata, MAX_FRONT_MATTER_LINES,
+)
+
+
+class TestFrontMatter(unittest.TestCase):
+    def test_parse_values(self):
+        metadata = parse_front_matter([
+            'title: "A: B"',
+            "date: 2024-03-01",
+            "tags: [tolkien, 'elves']",
+            "draft: yes",
+            "# a comment",
+            "authors:",
+            "  - Tom",
+            "  - Goldberry",
+        ])
+        self.assertEqual(metadata, {
+            "title": "A: B",
+            "date": "2024-03-01",
+            "tags": ["tolkien", "elves"],
+            "draft": True,
+            "authors": ["Tom", "Goldberry"],
+        })
+
+    def test_split_keeps_line_numbers(self):
+        metadata, body = split_front_matter("---\ntitle: T\n---\n# Heading\n")
+        self.assertEqual(metadata, {"title": "T"})
+        self.assertEqual(body.split("\n"), ["", "", "", "# Heading", ""])
+
+    def test_without_front_matter(self):
+        self.assertEqual(split_front_matter("# Heading\n---\n"), ({}, "# Heading\n---\n"))
+        # An unclosed fence is just Markdown
+        metadata, lines = strip_front_matter(["---", "title: T", "text"])
+        self.assertEqual((metadata, list(lines)), ({}, ["---", "title: T", "text"]))
+
+    def test_unclosed_fence_stops_buffering(self):
+        consumed = []
+
+        def lines():
+            for i in range(10000):
+                consumed.append(i)
+                yield "---" if i == 0 else f"line {i}"
+
+        metadata, rest = strip_front_matter(lines())
+        self.assertEqual(metadata, {})
+        self.assertLessEqual(len(consumed), MAX_FRONT_MATTER_LINES + 1)
+        rest = list(rest)
+        self.assertEqual((len(rest), rest[0], rest[-1]), (10000, "---", "line 9999"))
+
+    def test_scan_metadata_reads_the_head_only(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "post.md")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("---\ndate: 2024-01-02\ntags: one, two\n---\n\n# The Title\n\nBody")
+            self.assertEqual(
+                scan_metadata(path),
+                {"title": "The Title", "date": "2024-01-02", "tags": ["one", "two"], "draft": False},
+            )
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("text\n" * 5 + "# Too late\n")
+            self.assertIsNone(scan_metadata(path, head_lines=5)["title"])
+
+
+if __name__ == "__main__":
+    unittest.main()
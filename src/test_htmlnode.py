@@ -1,5 +1,5 @@
 import unittest
-from htmlnode import HTMLNode,LeafNode,ParentNode
+from htmlnode import HTMLNode,LeafNode,ParentNode,NO_PROPS,NO_CHILDREN
 
 
 class TestHTMLNode(unittest.TestCase):
@@ -25,6 +25,26 @@ class TestHTMLNode(unittest.TestCase):
         expected = ''
         self.assertEqual(node.props_to_html(), expected)
 
+    def test_repr(self):
+        node = HTMLNode("p", "text")
+        self.assertEqual(repr(node), "HTMLNode(tag='p', value='text', children=[], props={})")
+
+    def test_slots_and_shared_empties(self):
+        first = LeafNode("b", "one")
+        second = LeafNode("b", "two")
+        self.assertFalse(hasattr(first, "__dict__"))
+        self.assertIs(first.props, NO_PROPS)
+        self.assertIs(first.children, NO_CHILDREN)
+        self.assertIs(first.props, second.props)
+
+    def test_props_to_html_cache_reset_on_assignment(self):
+        node = LeafNode("a", "link", {"href": "/one"})
+        self.assertEqual(node.props_to_html(), ' href="/one"')
+        node.props = {"href": "/two"}
+        self.assertEqual(node.props_to_html(), ' href="/two"')
+        node.props = None
+        self.assertEqual(node.props_to_html(), "")
+
 class TestLeafNode(unittest.TestCase):
     def test_leaf_to_html_p(self):
         node = LeafNode("p", "Hello, world!")
@@ -108,6 +128,23 @@ class TestParentNode(unittest.TestCase):
             '<section class="my-section"><p>Hello</p></section>'
         )
 
+    def test_render_to_streams_chunks(self):
+        parent = ParentNode("p", [LeafNode("b", "bold"), LeafNode(None, " text")], {"class": "x"})
+        chunks = []
+        parent.render_to(chunks.append)
+        self.assertEqual(chunks, ['<p class="x">', "<b>bold</b>", " text", "</p>"])
+        self.assertEqual("".join(chunks), parent.to_html())
+
+    def test_render_to_no_tag_error(self):
+        parent_node = ParentNode("div", [LeafNode("p", "text")])
+        parent_node.tag = None
+        with self.assertRaises(ValueError):
+            parent_node.render_to(lambda chunk: None)
+
+    def test_htmlnode_render_to_not_implemented(self):
+        with self.assertRaises(NotImplementedError):
+            HTMLNode("p", "text").to_html()
+
     
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+import urls
+from inline_cache import InlineCache
+from Block_type import markdown_to_html_node
+
+
+class TestInlineCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = InlineCache(max_entries=2)
+        urls.configure(urls.UrlResolver("/site/"))
+
+    def tearDown(self):
+        urls.configure(urls.UrlResolver())
+
+    def test_repeated_text_is_a_hit_with_same_html(self):
+        markdown = "- see [home](/index.html)\n\n- see [home](/index.html)"
+        html = markdown_to_html_node(markdown, self.cache).to_html()
+        self.assertEqual(html.count('<a href="/site/index.html">home</a>'), 2)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+        self.assertEqual(markdown_to_html_node(markdown).to_html(), html)
+
+    def test_hits_record_references_on_their_own_line(self):
+        resolver = urls.active()
+        with resolver.recording_references() as references:
+            markdown_to_html_node("![a](/a.png)\n\n![a](/a.png)", self.cache)
+        self.assertEqual(references, [("/a.png", 1), ("/a.png", 3)])
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_key_includes_resolver(self):
+        markdown_to_html_node("[x](/x.html)", self.cache)
+        urls.configure(urls.UrlResolver("/other/"))
+        html = markdown_to_html_node("[x](/x.html)", self.cache).to_html()
+        self.assertIn('href="/other/x.html"', html)
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 2))
+
+    def test_evicts_least_recently_used(self):
+        for text in ("a", "b", "a", "c"):
+            markdown_to_html_node(text, self.cache)
+        self.assertEqual(len(self.cache.entries), 2)
+        self.assertEqual([key[0] for key in self.cache.entries], ["a", "c"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,6 @@
 import unittest
 from textnode import TextNode, TextType
-from Inline_markdown import extract_markdown_images, extract_markdown_links,split_nodes_image, split_nodes_link,split_nodes_delimiter,markdown_to_blocks     # adjust import path
+from Inline_markdown import extract_markdown_images, extract_markdown_links,split_nodes_image, split_nodes_link,split_nodes_delimiter,markdown_to_blocks,text_to_textnodes     # adjust import path
 
 class TestMarkdownExtractors(unittest.TestCase):
 
@@ -282,6 +282,62 @@ class TestSplitNodesDelimiter(unittest.TestCase):
         result = split_nodes_delimiter([node], "**", TextType.BOLD)
         self.assertEqual(result, [node])
 
+class TestTextToTextNodes(unittest.TestCase):
+    def legacy_text_to_textnodes(self, text):
+        # The original five-pass pipeline, kept here as a reference
+        nodes = [TextNode(text, TextType.TEXT)]
+        nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+        nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
+        nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
+        nodes = split_nodes_image(nodes)
+        return split_nodes_link(nodes)
+
+    def test_all_inline_types(self):
+        text = "This is **text** with an _italic_ word and a `code block` and an ![obi wan image](https://i.imgur.com/fJRm4Vk.jpeg) and a [link](https://boot.dev)"
+        self.assertListEqual(
+            [
+                TextNode("This is ", TextType.TEXT),
+                TextNode("text", TextType.BOLD),
+                TextNode(" with an ", TextType.TEXT),
+                TextNode("italic", TextType.ITALIC),
+                TextNode(" word and a ", TextType.TEXT),
+                TextNode("code block", TextType.CODE),
+                TextNode(" and an ", TextType.TEXT),
+                TextNode("obi wan image", TextType.IMAGE, "https://i.imgur.com/fJRm4Vk.jpeg"),
+                TextNode(" and a ", TextType.TEXT),
+                TextNode("link", TextType.LINK, "https://boot.dev"),
+            ],
+            text_to_textnodes(text),
+        )
+
+    def test_matches_legacy_pipeline(self):
+        samples = [
+            "",
+            "plain text only",
+            "**bold** at start and _end_",
+            "Empty `` code",
+            "![a](url1)![b](url2)[A](urlA)[B](urlB)",
+            "Image ![img](url1) and link [link](url2) then `code`",
+            "Here's the deal, **I like Tolkien**.",
+            "Multi\nline **bold\ntext** here",
+        ]
+        for text in samples:
+            with self.subTest(text=text):
+                self.assertListEqual(self.legacy_text_to_textnodes(text), text_to_textnodes(text))
+
+    def test_underscore_in_image_url(self):
+        # The legacy pipeline split this URL into italic text
+        self.assertListEqual(
+            [TextNode("pic", TextType.IMAGE, "/images/my_pic_1.png")],
+            text_to_textnodes("![pic](/images/my_pic_1.png)"),
+        )
+
+    def test_unclosed_delimiter_is_text(self):
+        self.assertListEqual(
+            [TextNode("2 ** 3 is eight", TextType.TEXT)],
+            text_to_textnodes("2 ** 3 is eight"),
+        )
+
 class TestMarkdownToBlocks(unittest.TestCase):
 
     def test_markdown_to_blocks(self):
@@ -0,0 +1,35 @@
+import unittest
+from link_index import LinkIndex, internal_path, page_url
+
+
+class TestLinkIndex(unittest.TestCase):
+    def test_page_url(self):
+        self.assertEqual(page_url("index.html"), "/")
+        self.assertEqual(page_url("blog/tom/index.html"), "/blog/tom/")
+        self.assertEqual(page_url("about.html"), "/about.html")
+
+    def test_internal_path(self):
+        self.assertEqual(internal_path("/blog/tom?x=1#top"), "/blog/tom")
+        self.assertEqual(internal_path("../images/a.png", "/blog/tom/"), "/blog/images/a.png")
+        self.assertEqual(internal_path("other/", "/blog/tom.html"), "/blog/other/")
+        for url in ("https://example.com/", "//cdn.example.com/a.js", "mailto:me@example.com", "#top", ""):
+            self.assertIsNone(internal_path(url), url)
+
+    def test_broken(self):
+        index = LinkIndex()
+        index.add_target("/index.css")
+        index.add_target("/images/a.png")
+        index.add_page("content/index.md", "index.html", [("/blog/tom", 3), ("/index.css", None)])
+        index.add_page(
+            "content/blog/tom/index.md",
+            "blog/tom/index.html",
+            [("/", 1), ("../../images/a.png", 2), ("/missing", 4), ("b.png", 5), ("https://example.com", 6)],
+        )
+        self.assertEqual(
+            index.broken(),
+            [("content/blog/tom/index.md", 4, "/missing"), ("content/blog/tom/index.md", 5, "b.png")],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
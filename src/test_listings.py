@@ -0,0 +1,51 @@
+import unittest
+from listings import listing_pages, tag_slug
+
+
+def post(title, date=None, tags=()):
+    return {"title": title, "date": date, "tags": list(tags), "draft": False}
+
+
+class TestListingPages(unittest.TestCase):
+    def setUp(self):
+        self.index = {
+            "/": post("Home"),
+            "/blog/old/": post("Old", "2023-01-01", ["Python"]),
+            "/blog/new/": post("New", "2024-06-01", ["python", "web dev"]),
+            "/blog/undated/": post("Undated"),
+        }
+
+    def test_blog_pages_newest_first(self):
+        listings = listing_pages(self.index, "/blog/", "Blog", 2)
+        self.assertEqual([listing.url for listing in listings[:2]], ["/blog/", "/blog/page/2/"])
+        self.assertEqual([url for url, _ in listings[0].posts], ["/blog/new/", "/blog/old/"])
+        self.assertEqual([url for url, _ in listings[1].posts], ["/blog/undated/"])
+        self.assertEqual((listings[0].prev_url, listings[0].next_url), (None, "/blog/page/2/"))
+        self.assertEqual(listings[1].page_title(), "Blog (page 2 of 2)")
+
+    def test_tag_pages(self):
+        listings = listing_pages(self.index, "/blog/", "Blog", 10)
+        self.assertEqual([listing.url for listing in listings], ["/blog/", "/tags/python/", "/tags/web-dev/", "/tags/"])
+        self.assertEqual([url for url, _ in listings[1].posts], ["/blog/new/", "/blog/old/"])
+        self.assertEqual(listings[1].title, "Tagged: python")  # as the newest post spells it
+
+    def test_render(self):
+        listing = listing_pages(self.index, "/blog/", "Blog", 1)[0]
+        resolved = []
+        html = listing.render(lambda url: resolved.append(url) or "/site" + url)
+        self.assertEqual(
+            html,
+            '<div><h1>Blog</h1><ul class="posts"><li><a href="/site/blog/new/">New</a> '
+            '<time datetime="2024-06-01">2024-06-01</time> <span class="tags">'
+            '<a href="/site/tags/python/">python</a>, <a href="/site/tags/web-dev/">web dev</a></span></li></ul>'
+            '<nav class="pagination"><span>Page 1 of 3</span> <a href="/site/blog/page/2/" rel="next">Older</a></nav></div>',
+        )
+        self.assertIn("/blog/page/2/", resolved)
+
+    def test_tag_slug(self):
+        self.assertEqual(tag_slug(" Web Dev! "), "web-dev")
+        self.assertEqual(tag_slug("!!"), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,264 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+import urls
+import main
+from build_settings import BuildSettings
+from main import generate_pages_recursive, generate_page, generate_page_streaming
+from manifest import BuildManifest
+from link_index import LinkIndex
+
+
+class TestGeneratePagesRecursive(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = os.path.join(self.tmp.name, "content")
+        self.dest = os.path.join(self.tmp.name, "docs")
+        self.template = os.path.join(self.tmp.name, "template.html")
+        self.static = os.path.join(self.tmp.name, "static")
+        with open(self.template, "w", encoding="utf-8") as f:
+            f.write("<title>{{ Title }}</title><a href=\"/\">home</a>{{ Content }}")
+        for name in ("a", "b", "c", "d"):
+            self.write_page(f"{name}/index.md", f"# Page {name}\n\nHello **{name}**")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+        urls.configure(urls.UrlResolver())
+
+    def write_page(self, rel_path, text, mode="w"):
+        path = os.path.join(self.content, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, mode) as f:
+            f.write(text)
+
+    def read_output(self, rel_path):
+        with open(os.path.join(self.dest, rel_path), encoding="utf-8") as f:
+            return f.read()
+
+    def build(self, jobs=1, manifest=None, link_index=None, settings=None):
+        buffer = io.StringIO()
+        with contextlib.redirect_stdout(buffer):
+            generate_pages_recursive(
+                self.content,
+                self.template,
+                self.dest,
+                "/site/",
+                manifest,
+                jobs,
+                static_dir=self.static,
+                explain=True,
+                link_index=link_index,
+                settings=settings,
+            )
+        return buffer.getvalue()
+
+    def test_serial_and_parallel_output_match(self):
+        serial_log = self.build(jobs=1)
+        serial_page = self.read_output("c/index.html")
+        parallel_log = self.build(jobs=3)
+        self.assertEqual(serial_log, parallel_log)
+        self.assertEqual(serial_page, self.read_output("c/index.html"))
+        self.assertEqual(
+            serial_page,
+            '<title>Page c</title><a href="/site/">home</a><div><h1>Page c</h1><p>Hello <b>c</b></p></div>',
+        )
+
+    def test_pipelined_output_matches_serial(self):
+        serial_log = self.build()
+        serial_page = self.read_output("c/index.html")
+        pipelined_log = self.build(settings=BuildSettings(pipeline_depth=2))
+        self.assertEqual(serial_log, pipelined_log)
+        self.assertEqual(serial_page, self.read_output("c/index.html"))
+
+    def test_pipelined_write_failures_reported(self):
+        # A directory where the page should go makes its write fail
+        os.makedirs(os.path.join(self.dest, "b", "index.html"))
+        with self.assertRaises(RuntimeError) as cm:
+            self.build(settings=BuildSettings(pipeline_depth=2))
+        self.assertIn("1 of 4 page(s) failed to build", str(cm.exception))
+        self.assertIn(os.path.join("b", "index.md"), str(cm.exception))
+        self.assertIn("Page d", self.read_output("d/index.html"))
+
+    def test_failures_are_summarized(self):
+        self.write_page("broken/index.md", b"# Broken \xff", mode="wb")
+        with self.assertRaises(RuntimeError) as cm:
+            self.build(jobs=2)
+        message = str(cm.exception)
+        self.assertIn("1 of 5 page(s) failed to build", message)
+        self.assertIn("broken/index.md", message)
+        # The healthy pages are still written
+        self.assertIn("Page d", self.read_output("d/index.html"))
+
+    def test_dependency_graph_rebuilds_affected_pages(self):
+        os.makedirs(os.path.join(self.static, "images"))
+        image = os.path.join(self.static, "images", "a.png")
+        with open(image, "w") as f:
+            f.write("png")
+        self.write_page("b/index.md", "# Page b\n\n![a](/images/a.png)")
+        manifest_path = os.path.join(self.tmp.name, "manifest.json")
+
+        manifest = BuildManifest(manifest_path)
+        self.build(manifest=manifest)
+        manifest.save()
+        self.assertEqual(manifest.pages[os.path.join("b", "index.md")]["deps"].keys(), {self.template, image})
+
+        with open(image, "w") as f:
+            f.write("new png")
+        manifest = BuildManifest.load(manifest_path)
+        log = self.build(manifest=manifest, jobs=2)
+        manifest.save()
+        self.assertIn(f"Rebuilding {os.path.join('b', 'index.md')}: dependency changed: {image}", log)
+        self.assertIn("Skipped 3 unchanged page(s)", log)
+
+        with open(self.template, "a") as f:
+            f.write("<footer></footer>")
+        log = self.build(manifest=BuildManifest.load(manifest_path))
+        self.assertEqual(log.count(f"dependency changed: {self.template}"), 4)
+
+    def test_directory_templates_and_partials(self):
+        footer = os.path.join(self.tmp.name, "footer.html")
+        with open(footer, "w", encoding="utf-8") as f:
+            f.write("<footer></footer>")
+        directory_template = os.path.join(self.content, "b", "_template.html")
+        with open(directory_template, "w", encoding="utf-8") as f:
+            f.write(f'<main>{{{{ Content }}}}</main>{{{{ include "{footer}" }}}}')
+        manifest_path = os.path.join(self.tmp.name, "manifest.json")
+        manifest = BuildManifest(manifest_path)
+        self.build(manifest=manifest)
+        manifest.save()
+        self.assertEqual(self.read_output("b/index.html"),
+                         "<main><div><h1>Page b</h1><p>Hello <b>b</b></p></div></main><footer></footer>")
+        self.assertIn("<title>Page a</title>", self.read_output("a/index.html"))
+
+        with open(footer, "w", encoding="utf-8") as f:
+            f.write("<footer>new</footer>")
+        log = self.build(manifest=BuildManifest.load(manifest_path))
+        self.assertIn(f"Rebuilding {os.path.join('b', 'index.md')}: dependency changed: {footer}", log)
+        self.assertIn("Skipped 3 unchanged page(s)", log)
+        self.assertIn("<footer>new</footer>", self.read_output("b/index.html"))
+
+    def test_front_matter_drafts_and_listings(self):
+        self.write_page("blog/one.md", "---\ntitle: One\ndate: 2024-01-01\ntags: [x]\n---\n[c](/c/)\n")
+        self.write_page("blog/two.md", "---\ndraft: true\n---\n# Two\n")
+        manifest_path = os.path.join(self.tmp.name, "manifest.json")
+        manifest = BuildManifest(manifest_path)
+        metadata_index = {}
+        link_index = LinkIndex()
+        settings = BuildSettings(blog_dir="blog")
+        with contextlib.redirect_stdout(io.StringIO()) as log:
+            generate_pages_recursive(
+                self.content, self.template, self.dest, "/site/", manifest,
+                link_index=link_index, metadata_index=metadata_index, settings=settings,
+            )
+            main.generate_listing_pages(
+                metadata_index, self.content, self.template, self.dest, "/site/", manifest, link_index, settings
+            )
+        self.assertIn(f"Skipping draft: {os.path.join('blog', 'two.md')}", log.getvalue())
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "blog", "two.html")))
+        self.assertEqual(
+            self.read_output("blog/one.html"),
+            '<title>One</title><a href="/site/">home</a><div><p><a href="/site/c/">c</a></p></div>',
+        )
+        source = os.path.join(self.content, "blog", "one.md")
+        self.assertEqual(link_index.references[source][1], [("/", None), ("/c/", 6)])
+        self.assertIn('<a href="/site/blog/one.html">One</a>', self.read_output("blog/index.html"))
+        self.assertIn("<title>Tagged: x</title>", self.read_output("tags/x/index.html"))
+
+        # Without --blog, the listing pages go away again
+        with contextlib.redirect_stdout(io.StringIO()):
+            main.generate_listing_pages(metadata_index, self.content, self.template, self.dest, "/site/", manifest)
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "tags")))
+
+    def test_page_replacing_listing_is_kept(self):
+        self.write_page("blog/one.md", "---\ntitle: One\n---\nPost")
+        manifest_path = os.path.join(self.tmp.name, "manifest.json")
+        settings = BuildSettings(blog_dir="blog")
+
+        def build_blog(manifest):
+            metadata_index = {}
+            with contextlib.redirect_stdout(io.StringIO()) as log:
+                generate_pages_recursive(
+                    self.content, self.template, self.dest, "/site/", manifest,
+                    metadata_index=metadata_index, settings=settings,
+                )
+                main.generate_listing_pages(
+                    metadata_index, self.content, self.template, self.dest, "/site/", manifest, settings=settings
+                )
+            manifest.save()
+            return log.getvalue()
+
+        build_blog(BuildManifest(manifest_path))
+        self.assertIn('href="/site/blog/one.html"', self.read_output("blog/index.html"))
+        self.write_page("blog/index.md", "# Blog\n\nHand-written")
+        log = build_blog(BuildManifest.load(manifest_path))
+        self.assertIn("is a page of its own", log)
+        self.assertNotIn("Removed stale listing page", log)
+        self.assertIn("Hand-written", self.read_output("blog/index.html"))
+
+    def test_link_index_covers_skipped_pages(self):
+        self.write_page("a/index.md", "# Page a\n\nSee [b](/b/) and\n[nothing](/nothing)")
+        manifest_path = os.path.join(self.tmp.name, "manifest.json")
+        manifest = BuildManifest(manifest_path)
+        self.build(manifest=manifest)
+        manifest.save()
+
+        link_index = LinkIndex()
+        log = self.build(manifest=BuildManifest.load(manifest_path), link_index=link_index)
+        self.assertIn("Skipped 4 unchanged page(s)", log)
+        source = os.path.join(self.content, "a", "index.md")
+        # The template's link to "/" resolves to the root page, which doesn't exist here
+        self.assertEqual(link_index.broken(), [(source, None, "/"), (source, 4, "/nothing")] + [
+            (os.path.join(self.content, name, "index.md"), None, "/") for name in ("b", "c", "d")
+        ])
+
+    def test_search_index_documents(self):
+        manifest_path = os.path.join(self.tmp.name, "manifest.json")
+        settings = BuildSettings(search=True)
+        documents = {}
+        manifest = BuildManifest(manifest_path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_pages_recursive(
+                self.content, self.template, self.dest, "/site/", manifest,
+                search_documents=documents, settings=settings,
+            )
+        manifest.save()
+        self.write_page("a/index.md", "# Page a\n\nGoodbye")
+        skipped_documents = {}
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_pages_recursive(
+                self.content, self.template, self.dest, "/site/",
+                BuildManifest.load(manifest_path), search_documents=skipped_documents, settings=settings,
+            )
+        self.assertEqual(sorted(documents), ["/site/a/", "/site/b/", "/site/c/", "/site/d/"])
+        self.assertEqual(documents["/site/c/"]["title"], "Page c")
+        self.assertEqual(skipped_documents["/site/c/"], documents["/site/c/"])
+        self.assertIn("goodbye", skipped_documents["/site/a/"]["terms"])
+
+    def test_streaming_matches_in_memory(self):
+        self.write_page("big/index.md", "intro\n\n# Big page\n\n```\ncode\n\nmore\n```\n\n- [a](/a)\n- ![b](/b.png)\n")
+        source = os.path.join(self.content, "big", "index.md")
+        in_memory = os.path.join(self.dest, "memory.html")
+        streamed = os.path.join(self.dest, "streamed.html")
+        settings = BuildSettings(search=True)
+        with contextlib.redirect_stdout(io.StringIO()):
+            page = generate_page(source, self.template, in_memory, "/site/", settings=settings)
+            self.assertEqual(generate_page_streaming(source, self.template, streamed, "/site/", settings), page)
+        self.assertEqual(page["references"], [("/", None), ("/a", 11), ("/b.png", 12)])
+        self.assertEqual(page["search"]["headings"], ["Big page"])
+        self.assertEqual(page["search"]["terms"]["big"], 13)
+        with open(in_memory, encoding="utf-8") as f:
+            expected = f.read()
+        with open(streamed, encoding="utf-8") as f:
+            self.assertEqual(f.read(), expected)
+        self.assertIn("<title>Big page</title>", expected)
+
+    def test_large_sources_use_streaming(self):
+        log = self.build(settings=BuildSettings(stream_threshold=0))
+        self.assertIn("Generating page (streaming)", log)
+        self.assertIn("<b>c</b>", self.read_output("c/index.html"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import os
+import tempfile
+import unittest
+from manifest import BuildManifest, hash_file
+
+
+class TestBuildManifest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+        self.source = os.path.join(self.dir, "index.md")
+        self.dest = os.path.join(self.dir, "index.html")
+        with open(self.source, "w", encoding="utf-8") as f:
+            f.write("# Hello")
+        with open(self.dest, "w", encoding="utf-8") as f:
+            f.write("<h1>Hello</h1>")
+        self.template = os.path.join(self.dir, "template.html")
+        self.write(self.template, "{{ Content }}")
+        self.image = os.path.join(self.dir, "a.png")
+        self.write(self.image, "png")
+        self.path = os.path.join(self.dir, "manifest.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, path, text):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def record(self, manifest, basepath="/", dependencies=None):
+        if dependencies is None:
+            dependencies = [self.template]
+        reasons, entry = manifest.check_page("index.md", self.source, basepath, self.dest, [self.template])
+        manifest.record_page("index.md", entry, dependencies)
+        return reasons
+
+    def test_new_page_is_changed(self):
+        manifest = BuildManifest(self.path)
+        self.assertEqual(self.record(manifest), ["new page"])
+
+    def test_unchanged_after_reload(self):
+        manifest = BuildManifest(self.path)
+        self.record(manifest)
+        manifest.save()
+        reloaded = BuildManifest.load(self.path)
+        self.assertFalse(self.record(reloaded))
+
+    def test_source_change_detected(self):
+        manifest = BuildManifest(self.path)
+        self.record(manifest)
+        with open(self.source, "w", encoding="utf-8") as f:
+            f.write("# Hello again")
+        self.assertEqual(self.record(manifest), ["source changed"])
+        self.assertEqual(manifest.pages["index.md"]["source_hash"], hash_file(self.source))
+
+    def test_template_and_basepath_change_detected(self):
+        manifest = BuildManifest(self.path)
+        self.record(manifest)
+        manifest.save()
+        self.write(self.template, "<main>{{ Content }}</main>")
+        manifest = BuildManifest.load(self.path)
+        self.assertEqual(self.record(manifest), [f"dependency changed: {self.template}"])
+        self.assertEqual(self.record(manifest, basepath="/site/"), ["basepath changed"])
+
+    def test_asset_dependencies(self):
+        manifest = BuildManifest(self.path)
+        self.record(manifest, dependencies=[self.template, self.image])
+        manifest.save()
+        self.assertIn(self.image, BuildManifest.load(self.path).files)
+
+        self.write(self.image, "new png")
+        manifest = BuildManifest.load(self.path)
+        self.assertEqual(self.record(manifest), [f"dependency changed: {self.image}"])
+        # The page no longer references the image, so it is forgotten
+        manifest.save()
+        self.assertNotIn(self.image, BuildManifest.load(self.path).files)
+
+        self.record(manifest, dependencies=[self.template, self.image])
+        os.remove(self.image)
+        manifest = BuildManifest(self.path, manifest.pages, files=manifest.files)
+        self.assertEqual(self.record(manifest), [f"dependency removed: {self.image}"])
+
+    def test_new_dependency_detected(self):
+        manifest = BuildManifest(self.path)
+        self.record(manifest, dependencies=[])
+        self.assertEqual(self.record(manifest), [f"new dependency: {self.template}"])
+
+    def test_settings_change_detected(self):
+        manifest = BuildManifest(self.path)
+        self.record(manifest)
+        reasons, _ = manifest.check_page("index.md", self.source, "/", self.dest, [self.template], {"minify": "minify"})
+        self.assertEqual(reasons, ["build settings changed"])
+
+    def test_forced(self):
+        manifest = BuildManifest(self.path)
+        self.record(manifest)
+        manifest.force = True
+        self.assertEqual(self.record(manifest), ["forced"])
+
+    def test_missing_output_is_changed(self):
+        manifest = BuildManifest(self.path)
+        self.record(manifest)
+        os.remove(self.dest)
+        self.assertEqual(self.record(manifest), ["output missing"])
+
+    def test_remove_stale(self):
+        manifest = BuildManifest(self.path)
+        self.record(manifest)
+        manifest.save()
+        reloaded = BuildManifest.load(self.path)
+        self.assertEqual(reloaded.remove_stale(), [self.dest])
+        self.assertFalse(os.path.exists(self.dest))
+        self.assertEqual(reloaded.pages, {})
+
+    def test_load_missing_or_corrupt(self):
+        self.assertEqual(BuildManifest.load(self.path).pages, {})
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("{not json")
+        self.assertEqual(BuildManifest.load(self.path).pages, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
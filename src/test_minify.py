@@ -0,0 +1,59 @@
+import unittest
+from minify import HtmlMinifier
+from template import compile_template
+from urls import UrlResolver
+
+
+class TestHtmlMinifier(unittest.TestCase):
+    def test_collapses_whitespace_and_strips_comments(self):
+        html = (
+            "<!doctype html>\n<html>\n  <head>\n    <title> A  title </title>\n  </head>\n"
+            "  <!-- nav -->\n  <body>\n    <p>Some   <b>bold</b>\n text</p>\n  </body>\n</html>\n"
+        )
+        self.assertEqual(
+            HtmlMinifier().minify(html),
+            "<!doctype html><html><head><title>A title</title></head><body><p>Some <b>bold</b> text</p></body></html>",
+        )
+
+    def test_inline_whitespace_kept(self):
+        self.assertEqual(HtmlMinifier().minify("<p><b>a</b> <i>b</i></p>"), "<p><b>a</b> <i>b</i></p>")
+
+    def test_pre_and_code_preserved(self):
+        html = "<div>\n<pre><code>a  =  1\n\n<!-- not a comment -->\n</code></pre>\n<p>use <code>x  y</code></p></div>"
+        self.assertEqual(
+            HtmlMinifier().minify(html),
+            "<div><pre><code>a  =  1\n\n<!-- not a comment -->\n</code></pre><p>use <code>x  y</code></p></div>",
+        )
+
+    def test_drop_optional_tags(self):
+        html = "<html><head><title>t</title></head><body><ul><li>a</li><li>b</li></ul><p>x</p><p>y</p></body></html>"
+        self.assertEqual(
+            HtmlMinifier(drop_optional_tags=True).minify(html),
+            "<html><head><title>t</title><body><ul><li>a<li>b</ul><p>x<p>y",
+        )
+
+    def test_required_end_tags_kept(self):
+        minifier = HtmlMinifier(drop_optional_tags=True)
+        self.assertEqual(minifier.minify("<a href='/'><p>x</p></a>"), "<a href='/'><p>x</p></a>")
+        self.assertEqual(minifier.minify("<div><p>x</p><span>y</span></div>"), "<div><p>x</p><span>y</span></div>")
+
+    def test_followed_by(self):
+        minifier = HtmlMinifier(drop_optional_tags=True)
+        self.assertEqual(minifier.minify("<p>x</p>"), "<p>x</p>")
+        self.assertEqual(minifier.minify("<p>x</p>", followed_by="</div>"), "<p>x")
+
+    def test_template_minified_at_compile_time(self):
+        template = compile_template(
+            "<html>\n  <body>\n    <article>{{ Content }}</article>\n  </body>\n</html>",
+            UrlResolver(),
+            HtmlMinifier(),
+        )
+        self.assertEqual(template.segments, ["<html><body><article>", "Content", "</article></body></html>"])
+
+    def test_template_not_minified_without_minifier(self):
+        template = compile_template("<p>\n  {{ Title }}\n</p>", UrlResolver())
+        self.assertEqual(template.segments, ["<p>\n  ", "Title", "\n</p>"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import os
+import tempfile
+import unittest
+from parse_cache import ParseCache
+
+
+class TestParseCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ParseCache(os.path.join(self.tmp.name, "cache"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        key = self.cache.key("# Title")
+        self.assertIsNone(self.cache.get(key))
+        self.cache.put(key, {"html": "<h1>Title</h1>", "title": "Title"})
+        self.assertEqual(self.cache.get(key), {"html": "<h1>Title</h1>", "title": "Title"})
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_key_depends_on_content_and_context(self):
+        self.assertEqual(self.cache.key("a"), self.cache.key("a"))
+        self.assertNotEqual(self.cache.key("a"), self.cache.key("b"))
+        self.assertNotEqual(self.cache.key("a"), self.cache.key("a", context="/site/"))
+
+    def test_corrupt_record_is_a_miss(self):
+        key = self.cache.key("x")
+        self.cache.put(key, {"html": ""})
+        with open(self.cache._path(key), "wb") as f:
+            f.write(b"garbage")
+        self.assertIsNone(self.cache.get(key))
+
+    def test_trim_evicts_least_recently_used(self):
+        keys = [self.cache.key(str(i)) for i in range(3)]
+        for i, key in enumerate(keys):
+            self.cache.put(key, {"html": "x" * 100})
+            os.utime(self.cache._path(key), ns=(i * 10**9, i * 10**9))
+        self.cache.get(keys[0])  # most recently used now
+        size = os.path.getsize(self.cache._path(keys[0]))
+        self.cache.max_bytes = size * 2
+        self.assertEqual(self.cache.trim(), 1)
+        self.assertIsNotNone(self.cache.get(keys[0]))
+        self.assertIsNone(self.cache.get(keys[1]))
+        self.assertIsNotNone(self.cache.get(keys[2]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pipeline import prefetched, BoundedWriter
+
+
+class TestPipeline(unittest.TestCase):
+    def test_prefetched_keeps_order_and_bound(self):
+        started = []
+
+        def read(item):
+            started.append(item)
+            return item * 10
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            seen = []
+            for item, future in prefetched(range(10), read, executor, depth=3):
+                # Never more than `depth` reads beyond the current item
+                self.assertLessEqual(len(started), item + 4)
+                seen.append((item, future.result()))
+        self.assertEqual(seen, [(i, i * 10) for i in range(10)])
+
+    def test_bounded_writer(self):
+        in_flight = []
+        peak = []
+        lock = threading.Lock()
+
+        def write(value):
+            with lock:
+                in_flight.append(value)
+                peak.append(len(in_flight))
+            time.sleep(0.005)
+            with lock:
+                in_flight.remove(value)
+            if value == 3:
+                raise OSError("disk full")
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            writer = BoundedWriter(executor, depth=2)
+            for i in range(6):
+                writer.submit(i, write, i)
+            errors = writer.wait()
+        self.assertLessEqual(max(peak), 2)
+        self.assertEqual([(key, str(error)) for key, error in errors], [(3, "disk full")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import gzip
+import os
+import tempfile
+import unittest
+from precompress import gzip_bytes, precompress_tree, remove_compressed
+
+
+class TestPrecompress(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, rel_path, data):
+        path = os.path.join(self.dir, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_gzip_bytes_is_reproducible(self):
+        data = b"<p>hello</p>" * 100
+        self.assertEqual(gzip.decompress(gzip_bytes(data, 6)), data)
+        self.assertEqual(gzip_bytes(data), gzip_bytes(data))
+
+    def test_precompress_tree(self):
+        page = self.write("blog/index.html", b"<p>hello</p>" * 200)
+        self.write("index.css", b"body {}")  # below min_size
+        self.write("images/a.png", b"\x89PNG" * 500)
+        self.write(".build-manifest.json", b"{}" * 1000)
+
+        written, stats = precompress_tree(self.dir, min_size=100, jobs=2)
+        self.assertEqual(stats, {"compressed": 1, "unchanged": 0, "removed": 0})
+        self.assertEqual(written, [os.path.join("blog", "index.html.gz")])
+        with gzip.open(page + ".gz") as f:
+            self.assertEqual(f.read(), b"<p>hello</p>" * 200)
+        self.assertFalse(os.path.exists(os.path.join(self.dir, "index.css.gz")))
+        self.assertFalse(os.path.exists(os.path.join(self.dir, "images", "a.png.gz")))
+        self.assertFalse(os.path.exists(os.path.join(self.dir, ".build-manifest.json.gz")))
+
+        written, stats = precompress_tree(self.dir, min_size=100, previous=written)
+        self.assertEqual(stats, {"compressed": 0, "unchanged": 1, "removed": 0})
+
+        # Rewriting the page changes its mtime, so it is compressed again
+        self.write("blog/index.html", b"<p>changed</p>" * 200)
+        os.utime(page, ns=(0, 0))
+        _, stats = precompress_tree(self.dir, min_size=100, previous=written)
+        self.assertEqual(stats["compressed"], 1)
+        with gzip.open(page + ".gz") as f:
+            self.assertEqual(f.read(), b"<p>changed</p>" * 200)
+
+    def test_stale_siblings_removed(self):
+        page = self.write("index.html", b"x" * 200)
+        archive = self.write("files/archive.tar.gz", b"data")
+        written, _ = precompress_tree(self.dir, min_size=100)
+        os.remove(page)
+        _, stats = precompress_tree(self.dir, min_size=100, previous=written)
+        self.assertEqual(stats["removed"], 1)
+        self.assertFalse(os.path.exists(page + ".gz"))
+        self.assertTrue(os.path.exists(archive))
+
+    def test_other_gz_files_left_alone(self):
+        # A .gz shipped on its own, and one shipped next to its source
+        feed = self.write("data/feed.json.gz", b"shipped")
+        self.write("data/list.json", b"[]" * 100)
+        shipped = self.write("data/list.json.gz", b"shipped too")
+        published = [os.path.join("data", "feed.json.gz"), os.path.join("data", "list.json.gz")]
+        for _ in range(2):
+            written, stats = precompress_tree(self.dir, min_size=100, previous=[], published=published)
+            self.assertEqual((written, stats["removed"]), ([], 0))
+        for path in (feed, shipped):
+            with open(path, "rb") as f:
+                self.assertTrue(f.read().startswith(b"shipped"))
+
+    def test_remove_compressed(self):
+        page = self.write("index.html", b"x" * 200)
+        feed = self.write("feed.json.gz", b"shipped")
+        written, _ = precompress_tree(self.dir, min_size=100)
+        removed = remove_compressed(self.dir, written + ["feed.json.gz", "gone.html.gz"], ["feed.json.gz"])
+        self.assertEqual(removed, 1)
+        self.assertFalse(os.path.exists(page + ".gz"))
+        self.assertTrue(os.path.exists(page))
+        self.assertTrue(os.path.exists(feed))
+
+
+if __name__ == "__main__":
+    unittest.main()
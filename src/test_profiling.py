@@ -0,0 +1,48 @@
+import time
+import unittest
+import profiling
+from profiling import BuildProfiler, stage
+from Block_type import markdown_to_html_node
+
+
+class TestBuildProfiler(unittest.TestCase):
+    def tearDown(self):
+        profiling.activate(None)
+
+    def test_stage_is_noop_when_inactive(self):
+        with stage("anything"):
+            pass
+        self.assertIsNone(profiling.active())
+
+    def test_nested_stages_are_exclusive(self):
+        profiler = BuildProfiler()
+        with profiler.stage("outer"):
+            time.sleep(0.01)
+            with profiler.stage("inner"):
+                time.sleep(0.02)
+        outer = profiler.build_stages["outer"]["time"]
+        inner = profiler.build_stages["inner"]["time"]
+        self.assertGreaterEqual(inner, 0.02)
+        self.assertLess(outer, 0.02)
+
+    def test_page_stages_recorded_per_page(self):
+        profiler = BuildProfiler()
+        profiling.activate(profiler)
+        with profiler.page("a.md"):
+            markdown_to_html_node("# Title\n\nSome **bold** text\n\n- one\n- two")
+        with stage("static_copy"):
+            pass
+        stages = profiler.pages["a.md"]
+        self.assertEqual(stages["tree_build"]["calls"], 3)
+        self.assertEqual(stages["block_typing"]["calls"], 3)
+        self.assertEqual(stages["inline"]["calls"], 4)
+        self.assertIn("static_copy", profiler.build_stages)
+
+        report = profiler.report()
+        self.assertEqual(report["pages_profiled"], 1)
+        self.assertEqual(report["slowest_pages"][0]["page"], "a.md")
+        self.assertEqual(report["stages"]["inline"]["calls"], 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import json
+import os
+import tempfile
+import unittest
+from Block_type import markdown_to_html_node
+from search_index import SearchDocument, tokenize, write_search_index
+
+
+def read_json(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dest = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize("The Ring's power_level, 3 x Élan!"), ["ring", "power", "level", "élan"])
+
+    def test_document(self):
+        document = SearchDocument()
+        for node in markdown_to_html_node("# Rings\n\nThe **rings** of power\n\n![Mount Doom](/doom.png)").children:
+            document.add_node(node)
+        data = document.to_dict("Rings of Power")
+        self.assertEqual(data["headings"], ["Rings"])
+        self.assertEqual(data["terms"], {"rings": 14, "power": 11, "mount": 1, "doom": 1})
+
+    def test_write_search_index(self):
+        documents = {
+            "/b/": {"title": "B", "headings": [], "terms": {"ring": 1, "road": 2}},
+            "/a/": {"title": "A", "headings": [], "terms": {"ring": 5}},
+        }
+        stats = write_search_index(documents, self.dest)
+        self.assertEqual(stats, {"written": 4, "unchanged": 0, "removed": 0})
+        search_dir = os.path.join(self.dest, "search")
+        self.assertEqual(read_json(os.path.join(search_dir, "documents.json")), [["/a/", "A"], ["/b/", "B"]])
+        self.assertEqual(read_json(os.path.join(search_dir, "meta.json")), {"prefix_length": 2, "shards": ["ri", "ro"]})
+        self.assertEqual(read_json(os.path.join(search_dir, "terms", "ri.json")), {"ring": [[0, 5], [1, 1]]})
+
+        # Only the shard whose terms changed is rewritten; empty shards go
+        documents["/b/"]["terms"] = {"ring": 2}
+        stats = write_search_index(documents, self.dest)
+        self.assertEqual(stats, {"written": 2, "unchanged": 1, "removed": 1})
+        self.assertFalse(os.path.exists(os.path.join(search_dir, "terms", "ro.json")))
+
+
+if __name__ == "__main__":
+    unittest.main()
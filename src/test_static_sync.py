@@ -0,0 +1,113 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from manifest import hash_file
+from static_sync import sync_static_files, asset_map, fingerprinted_path
+
+
+class TestSyncStaticFiles(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.tmp.name, "static")
+        self.dest = os.path.join(self.tmp.name, "docs")
+        self.write(self.source, "index.css", "body {}")
+        self.write(self.source, "images/a.png", "png-a")
+        self.write(self.source, "images/b.png", "png-b")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, root, rel_path, text):
+        path = os.path.join(root, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+        return path
+
+    def sync(self, previous=None, use_hash=False, fingerprint=False):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return sync_static_files(self.source, self.dest, previous, use_hash, fingerprint)
+
+    def test_first_sync_copies_everything(self):
+        state, stats = self.sync()
+        self.assertEqual(stats, {"copied": 3, "unchanged": 0, "removed": 0})
+        self.assertEqual(set(state), {"index.css", os.path.join("images", "a.png"), os.path.join("images", "b.png")})
+        with open(os.path.join(self.dest, "images", "b.png")) as f:
+            self.assertEqual(f.read(), "png-b")
+
+    def test_only_changed_files_copied(self):
+        state, _ = self.sync()
+        self.write(self.source, "index.css", "body { color: red }")
+        state, stats = self.sync(state)
+        self.assertEqual(stats, {"copied": 1, "unchanged": 2, "removed": 0})
+
+    def test_stale_files_removed_but_pages_kept(self):
+        state, _ = self.sync()
+        page = self.write(self.dest, "index.html", "<html></html>")
+        os.remove(os.path.join(self.source, "images", "a.png"))
+        state, stats = self.sync(state)
+        self.assertEqual(stats["removed"], 1)
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "images", "a.png")))
+        self.assertTrue(os.path.exists(page))
+
+    def test_hash_mode_skips_touched_identical_files(self):
+        state, _ = self.sync(use_hash=True)
+        source_css = os.path.join(self.source, "index.css")
+        os.utime(source_css, ns=(10**18, 10**18))
+        state, stats = self.sync(state, use_hash=True)
+        self.assertEqual(stats, {"copied": 0, "unchanged": 3, "removed": 0})
+        self.assertEqual(os.stat(os.path.join(self.dest, "index.css")).st_mtime_ns, 10**18)
+        # Without hashing the touched file is copied again
+        os.utime(source_css, ns=(2 * 10**18, 2 * 10**18))
+        _, stats = self.sync(state)
+        self.assertEqual(stats["copied"], 1)
+
+    def test_fingerprint(self):
+        source_css = os.path.join(self.source, "index.css")
+        css_name = fingerprinted_path("index.css", hash_file(source_css))
+        self.assertRegex(css_name, r"^index\.[0-9a-f]{10}\.css$")
+
+        state, stats = self.sync(fingerprint=True)
+        self.assertEqual(stats["copied"], 3)
+        self.assertTrue(os.path.exists(os.path.join(self.dest, css_name)))
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "index.css")))
+        assets = asset_map(state)
+        self.assertEqual(assets["/index.css"], "/" + css_name)
+        self.assertEqual(len(assets), 3)
+
+        # A changed file gets a new name and its old version is removed
+        self.write(self.source, "index.css", "body { color: red }")
+        state, stats = self.sync(state, fingerprint=True)
+        self.assertEqual(stats, {"copied": 1, "unchanged": 2, "removed": 0})
+        self.assertFalse(os.path.exists(os.path.join(self.dest, css_name)))
+        self.assertTrue(os.path.exists(os.path.join(self.dest, asset_map(state)["/index.css"][1:])))
+
+        # Switching fingerprinting off publishes plain names again
+        state, _ = self.sync(state)
+        self.assertEqual(asset_map(state), {})
+        self.assertEqual(sorted(os.listdir(self.dest)), ["images", "index.css"])
+
+    def test_fingerprint_skips_fixed_names_and_css_references(self):
+        for rel_path in ("CNAME", ".nojekyll", "robots.txt", "favicon.ico", "site.webmanifest",
+                         ".well-known/security.txt", "fonts/a.woff2"):
+            self.write(self.source, rel_path, "x")
+        self.write(self.source, "index.css", "@font-face { src: url('fonts/a.woff2') } "
+                                             'body { background: url("/images/a.png?v=1") }')
+        state, _ = self.sync(fingerprint=True)
+        self.assertEqual(sorted(asset_map(state)), ["/images/b.png", "/index.css"])
+        for rel_path in ("CNAME", ".nojekyll", "robots.txt", "favicon.ico", "site.webmanifest",
+                         ".well-known/security.txt", "fonts/a.woff2", "images/a.png"):
+            self.assertTrue(os.path.exists(os.path.join(self.dest, rel_path)), rel_path)
+        self.assertEqual(state["index.css"]["refs"], [os.path.join("fonts", "a.woff2"), os.path.join("images", "a.png")])
+
+        # Once the stylesheet stops referring to it, a file is fingerprinted
+        self.write(self.source, "index.css", "body {}")
+        state, _ = self.sync(state, fingerprint=True)
+        self.assertIn("/images/a.png", asset_map(state))
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "images", "a.png")))
+
+
+if __name__ == "__main__":
+    unittest.main()
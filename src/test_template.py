@@ -0,0 +1,116 @@
+import os
+import tempfile
+import unittest
+from template import compile_template, load_template, find_template
+from urls import UrlResolver
+
+
+class TestCompileTemplate(unittest.TestCase):
+    def test_segments(self):
+        template = compile_template("<title>{{ Title }}</title><body>{{Content}}</body>")
+        self.assertEqual(
+            template.segments,
+            ["<title>", "Title", "</title><body>", "Content", "</body>"],
+        )
+        self.assertEqual(template.placeholders, ["Title", "Content"])
+
+    def test_render(self):
+        template = compile_template("<h1>{{ Title }}</h1>{{ Content }}")
+        self.assertEqual(
+            template.render({"Title": "Hi", "Content": "<p>x</p>"}),
+            "<h1>Hi</h1><p>x</p>",
+        )
+
+    def test_render_extra_placeholders(self):
+        template = compile_template("{{ Title }}|{{ Date }}|{{ Description }}")
+        self.assertEqual(
+            template.render({"Title": "T", "Date": "2024-01-01"}),
+            "T|2024-01-01|",
+        )
+
+    def test_render_does_not_expand_values(self):
+        template = compile_template("{{ Title }}:{{ Content }}")
+        self.assertEqual(
+            template.render({"Title": "{{ Content }}", "Content": "c"}),
+            "{{ Content }}:c",
+        )
+
+    def test_basepath_applied_at_compile_time(self):
+        template = compile_template(
+            '<a href="/">x</a><img src="/a.png"><a href="//cdn/x">{{ Content }}',
+            UrlResolver("/site/"),
+        )
+        rendered = template.render({"Content": '<a href="/raw">'})
+        self.assertEqual(rendered, '<a href="/site/">x</a><img src="/site/a.png"><a href="//cdn/x"><a href="/raw">')
+
+    def test_render_to_streams_callables(self):
+        template = compile_template("<h1>{{ Title }}</h1>{{ Content }}<footer>")
+        chunks = []
+        template.render_to(chunks.append, {"Title": "Hi", "Content": lambda write: write("<p>x</p>")})
+        self.assertEqual("".join(chunks), "<h1>Hi</h1><p>x</p><footer>")
+
+    def test_no_placeholders(self):
+        self.assertEqual(compile_template("plain").render({}), "plain")
+
+
+class TestLoadTemplate(unittest.TestCase):
+    def test_cached_until_changed(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "template.html")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("A {{ Content }}")
+            first = load_template(path)
+            self.assertIs(first, load_template(path))
+
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("Changed {{ Content }}")
+            os.utime(path, ns=(0, 0))
+            second = load_template(path)
+            self.assertIsNot(first, second)
+            self.assertEqual(second.render({"Content": "!"}), "Changed !")
+
+    def write(self, path, text):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def test_includes_are_spliced_and_tracked(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            nav = os.path.join(tmp, "nav.html")
+            path = os.path.join(tmp, "template.html")
+            self.write(nav, '<nav><a href="/">{{ Title }}</a></nav>')
+            self.write(path, f'<body>{{{{ include "{nav}" }}}}{{{{ Content }}}}</body>')
+            template = load_template(path, UrlResolver("/site/"))
+            self.assertEqual(
+                template.render({"Title": "T", "Content": "c"}),
+                '<body><nav><a href="/site/">T</a></nav>c</body>',
+            )
+            self.assertEqual(template.placeholders, ["Title", "Content"])
+            self.assertEqual(template.references, [("/", None)])
+            self.assertEqual(template.files, [path, nav])
+
+            # Editing the partial recompiles the templates that include it
+            self.write(nav, "<nav>new</nav>")
+            os.utime(nav, ns=(0, 0))
+            self.assertEqual(load_template(path, UrlResolver("/site/")).render({}), "<body><nav>new</nav></body>")
+
+    def test_include_cycle(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            a = os.path.join(tmp, "a.html")
+            b = os.path.join(tmp, "b.html")
+            self.write(a, f'{{{{ include "{b}" }}}}')
+            self.write(b, f'{{{{ include "{a}" }}}}')
+            with self.assertRaises(ValueError):
+                load_template(a)
+
+    def test_find_template(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            blog = os.path.join(tmp, "blog")
+            os.makedirs(os.path.join(blog, "post"))
+            self.write(os.path.join(blog, "_template.html"), "{{ Content }}")
+            self.assertEqual(find_template(os.path.join(blog, "post"), tmp, "default"),
+                             os.path.join(blog, "_template.html"))
+            self.assertEqual(find_template(tmp, tmp, "default"), "default")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -84,6 +84,11 @@ class TestTextNode(unittest.TestCase):
         node2 = TextNode("Link", TextType.LINK, "https://example.com")
         self.assertEqual(node, node2)
 
+    def test_slotted(self):
+        node = TextNode("Text", TextType.TEXT)
+        self.assertFalse(hasattr(node, "__dict__"))
+        self.assertEqual(repr(node), "TextNode(Text, TextType.TEXT, None)")
+
 
 
 if __name__ == "__main__":
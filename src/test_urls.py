@@ -0,0 +1,71 @@
+import unittest
+import urls
+from urls import UrlResolver
+from textnode import TextNode, TextType, text_node_to_html_node
+from Block_type import markdown_to_html_node
+
+
+class TestUrlResolver(unittest.TestCase):
+    def tearDown(self):
+        urls.configure(UrlResolver())
+
+    def test_resolve(self):
+        resolver = UrlResolver("/site/")
+        self.assertEqual(resolver.resolve("/"), "/site/")
+        self.assertEqual(resolver.resolve("/images/a.png"), "/site/images/a.png")
+        self.assertEqual(resolver.resolve("https://example.com/a"), "https://example.com/a")
+        self.assertEqual(resolver.resolve("//cdn.example.com/a"), "//cdn.example.com/a")
+        self.assertEqual(resolver.resolve("relative/page"), "relative/page")
+
+    def test_resolve_html_attributes(self):
+        resolver = UrlResolver("/site/")
+        self.assertEqual(
+            resolver.resolve_html_attributes('<link href="/index.css"><img src="/a.png" data-x="/b">'),
+            '<link href="/site/index.css"><img src="/site/a.png" data-x="/b">',
+        )
+
+    def test_recording_references(self):
+        resolver = urls.use_basepath("/site/")
+        with resolver.recording_references() as references:
+            markdown_to_html_node("[home](/) and ![a](/images/a.png) and [x](https://example.com)")
+            resolver.resolve_html_attributes('<link href="/index.css">')
+        self.assertEqual(
+            references,
+            [("/", 1), ("/images/a.png", 1), ("https://example.com", 1), ("/index.css", None)],
+        )
+        self.assertIsNone(resolver.references)
+
+    def test_fingerprinted_assets(self):
+        resolver = UrlResolver("/site/", {"/index.css": "/index.0123456789.css"})
+        self.assertEqual(resolver.resolve("/index.css"), "/site/index.0123456789.css")
+        self.assertEqual(resolver.resolve("/index.css?v=1#top"), "/site/index.0123456789.css?v=1#top")
+        self.assertEqual(resolver.resolve("/other.css"), "/site/other.css")
+        self.assertEqual(
+            resolver.resolve_html_attributes('<link href="/index.css">'),
+            '<link href="/site/index.0123456789.css">',
+        )
+        self.assertNotEqual(resolver.key(), UrlResolver("/site/").key())
+
+    def test_use_basepath_keeps_assets(self):
+        urls.configure(UrlResolver("/", {"/a.png": "/a.0123456789.png"}))
+        resolver = urls.use_basepath("/site/")
+        self.assertEqual(resolver.resolve("/a.png"), "/site/a.0123456789.png")
+
+    def test_links_and_images_resolved_at_render_time(self):
+        urls.use_basepath("/site/")
+        link = text_node_to_html_node(TextNode("home", TextType.LINK, "/"))
+        image = text_node_to_html_node(TextNode("alt", TextType.IMAGE, "/images/a.png"))
+        self.assertEqual(link.to_html(), '<a href="/site/">home</a>')
+        self.assertEqual(image.props["src"], "/site/images/a.png")
+
+    def test_code_showing_html_is_not_rewritten(self):
+        urls.use_basepath("/site/")
+        md = 'Use `<a href="/docs">` for links, see [docs](/docs)'
+        self.assertEqual(
+            markdown_to_html_node(md).to_html(),
+            '<div><p>Use <code><a href="/docs"></code> for links, see <a href="/site/docs">docs</a></p></div>',
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
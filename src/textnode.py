@@ -1,5 +1,6 @@
 from enum import Enum
 from htmlnode import LeafNode
+from urls import resolve_url
 
 class TextType(Enum):
     BOLD = "bold"
@@ -10,6 +11,8 @@ class TextType(Enum):
     TEXT = "text"  # for plain text and other block-level content
 
 class TextNode:
+        __slots__ = ("text", "text_type", "url")
+
         def __init__(self, text: str, text_type: TextType, url: str = None):
             self.text = text
             self.text_type = text_type
@@ -53,13 +56,13 @@ def text_node_to_html_node(text_node: TextNode) -> LeafNode:
     elif ttype == TextType.LINK:
         if not url:
             raise ValueError("Link TextNode must have a URL.")
-        return LeafNode(tag="a", value=text, props={"href": url})
+        return LeafNode(tag="a", value=text, props={"href": resolve_url(url)})
 
     elif ttype == TextType.IMAGE:
         if not url:
             raise ValueError("Image TextNode must have a URL for 'src'.")
         # alt text is the text content
-        return LeafNode(tag="img", value="", props={"src": url, "alt": text or ""})
+        return LeafNode(tag="img", value="", props={"src": resolve_url(url), "alt": text or ""})
 
     else:
         raise ValueError(f"Unsupported TextType: {ttype}")
\ No newline at end of file
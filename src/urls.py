@@ -0,0 +1,104 @@
+import contextlib
+import hashlib
+import json
+import re
+
+TEMPLATE_URL_PATTERN = re.compile(r'\b(href|src)="(/[^"]*)"')
+
+
+class UrlResolver:
+    """
+    Maps root-relative URLs ("/images/a.png") to the URLs the built site
+    actually uses, e.g. under a basepath ("/repo/images/a.png"). Absolute
+    and relative URLs, and protocol-relative "//host/..." ones, are left
+    alone. `assets` maps the URLs of fingerprinted static files to the
+    URLs they are published under ({"/index.css": "/index.3f9a1c0b2d.css"}).
+    """
+
+    def __init__(self, basepath="/", assets=None):
+        self.basepath = basepath
+        self.assets = assets or {}
+        self.references = None  # (url, source line) pairs while recording
+        self.source_line = None  # line of the block being converted
+        self._key = basepath
+        if self.assets:
+            digest = hashlib.sha256(json.dumps(self.assets, sort_keys=True).encode("utf-8"))
+            self._key += "\0" + digest.hexdigest()
+
+    def resolve(self, url):
+        if self.references is not None:
+            self.references.append((url, self.source_line))
+        return self._resolve(url)
+
+    def _resolve(self, url):
+        if url.startswith("/") and not url.startswith("//"):
+            if self.assets:
+                url = self._fingerprinted(url)
+            return self.basepath + url[1:]
+        return url
+
+    def _fingerprinted(self, url):
+        path, sep, suffix = url.partition("#")
+        path, query_sep, query = path.partition("?")
+        published = self.assets.get(path)
+        if published is None:
+            return url
+        return published + query_sep + query + sep + suffix
+
+    @contextlib.contextmanager
+    def recording_references(self):
+        """
+        Collects the URLs resolved inside the block (the links and images
+        of the page being rendered) into the list it yields, as (url,
+        line) pairs. The line is that of the Markdown source, or None
+        outside of a page's blocks (e.g. for the template).
+        """
+        previous = (self.references, self.source_line)
+        self.references = []
+        self.source_line = None
+        try:
+            yield self.references
+        finally:
+            self.references, self.source_line = previous
+
+    def key(self):
+        # Identifies the resolver's configuration, for cache keys
+        return self._key
+
+    def resolve_html_attributes(self, html):
+        """
+        Resolves the href="/..." and src="/..." attributes in a piece of
+        trusted HTML (the page template), leaving other text untouched.
+        """
+        return TEMPLATE_URL_PATTERN.sub(
+            lambda match: f'{match.group(1)}="{self.resolve(match.group(2))}"',
+            html,
+        )
+
+
+# Configured once per build (and per worker process); used while
+# rendering links and images.
+_active = UrlResolver()
+
+
+def configure(resolver):
+    global _active
+    _active = resolver
+
+
+def active():
+    return _active
+
+
+def use_basepath(basepath):
+    """
+    Returns the active resolver, first replacing it if it was configured
+    for a different basepath. The asset map is kept.
+    """
+    if _active.basepath != basepath:
+        configure(UrlResolver(basepath, _active.assets))
+    return _active
+
+
+def resolve_url(url):
+    return _active.resolve(url)